@@ -6,12 +6,26 @@ class BaseQuery(ABC):
     def build(self):
         pass
 
+    def _render(self, out, params):
+        sql, query_params = self.build()
+        out.append(sql)
+        params.extend(query_params)
+
 
 class Expression(ABC):
     @abstractmethod
-    def __str__(self):
+    def _render(self, out, params):
+        # Appends this expression's SQL to `out` and its values to `params`, so
+        # a whole tree renders into one buffer and one param list.
         pass
 
-    @abstractmethod
+    def __str__(self):
+        out = []
+        self._render(out, [])
+        return "".join(out)
+
+    @property
     def params(self):
-        pass
+        params = []
+        self._render([], params)
+        return params
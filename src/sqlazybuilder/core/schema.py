@@ -0,0 +1,47 @@
+from .table import Table
+
+
+class Schema:
+    def __init__(self):
+        self._tables = {}
+
+    def table(self, name, columns=None, **column_types):
+        if columns is None and not column_types:
+            if name not in self._tables:
+                raise KeyError(f"Table '{name}' is not declared.")
+            return self._tables[name]
+
+        declared = dict(columns or {})
+        declared.update(column_types)
+        table = Table(name, columns=declared)
+        self._tables[name] = table
+        return table
+
+    def __getitem__(self, name):
+        return self._tables[name]
+
+    def __contains__(self, name):
+        return name in self._tables
+
+    def __iter__(self):
+        return iter(self._tables.values())
+
+    def __len__(self):
+        return len(self._tables)
+
+    @classmethod
+    def from_sqlite(cls, connection):
+        schema = cls()
+        schema.reflect_sqlite(connection)
+        return schema
+
+    def reflect_sqlite(self, connection):
+        table_names = [row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
+            "AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+        for table_name in table_names:
+            quoted = table_name.replace('"', '""')
+            columns = {row[1]: row[2] or None
+                       for row in connection.execute(f'PRAGMA table_info("{quoted}")')}
+            self.table(table_name, columns)
+        return self
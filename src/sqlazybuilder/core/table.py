@@ -1,10 +1,45 @@
+from collections.abc import Mapping
+
 from ..utils.factory import create_column
 
 
+class ColumnCollection:
+    def __init__(self, table):
+        self._columns = {name: create_column(table, name, data_type)
+                         for name, data_type in table.columns.items()}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise AttributeError(f"Table has no column '{name}'.") from None
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __iter__(self):
+        return iter(self._columns.values())
+
+    def __len__(self):
+        return len(self._columns)
+
+
 class Table:
-    def __init__(self, name, alias=None):
+    def __init__(self, name, alias=None, columns=None):
         self.name = name
         self.alias = alias
+        if columns is None:
+            self.columns = None
+        elif isinstance(columns, Mapping):
+            self.columns = dict(columns)
+        else:
+            self.columns = dict.fromkeys(columns)
+        self._c = None if self.columns is None else ColumnCollection(self)
 
     def __str__(self):
         table_representation = self.name
@@ -12,9 +47,19 @@ class Table:
             table_representation += f" AS {self.alias}"
         return table_representation
 
+    @property
+    def c(self):
+        if self._c is None:
+            raise AttributeError(f"Table '{self.name}' has no declared columns.")
+        return self._c
+
     def column(self, column_name):
-        return create_column(self, column_name)
+        if self.columns is None:
+            return create_column(self, column_name)
+        if column_name not in self.columns:
+            raise ValueError(f"Unknown column '{column_name}' for table '{self.name}'.")
+        return self.c[column_name]
 
     def as_alias(self, alias_name):
-        self.alias = alias_name
-        return self
+        # Tables are shared between queries, so aliasing returns a copy.
+        return Table(self.name, alias_name, self.columns)
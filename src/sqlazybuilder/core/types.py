@@ -0,0 +1,76 @@
+import re
+from decimal import Decimal
+
+
+def _to_int(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, Decimal) and value.is_finite() and value == value.to_integral_value():
+        return int(value)
+    if isinstance(value, str):
+        return int(value)
+    raise TypeError(f"Cannot convert {type(value).__name__} to an integer.")
+
+
+def _to_float(value):
+    if isinstance(value, float):
+        return value
+    if isinstance(value, (int, str, Decimal)) and not isinstance(value, bool):
+        return float(value)
+    raise TypeError(f"Cannot convert {type(value).__name__} to a float.")
+
+
+def _to_text(value):
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+
+def _to_bool(value):
+    if isinstance(value, bool):
+        return value
+    if value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.lower() in ("true", "false", "t", "f"):
+        return value.lower() in ("true", "t")
+    raise ValueError(f"Cannot convert {value!r} to a boolean.")
+
+
+BOOLEAN = "BOOLEAN"
+INTEGER = "INTEGER"
+TEXT = "TEXT"
+REAL = "REAL"
+
+_ADAPTERS = {BOOLEAN: _to_bool, INTEGER: _to_int, TEXT: _to_text, REAL: _to_float}
+
+
+_AFFINITIES = {
+    INTEGER: ("INT", "INTEGER", "TINYINT", "SMALLINT", "MEDIUMINT", "BIGINT", "UNSIGNED BIG INT",
+              "INT2", "INT4", "INT8", "SERIAL", "SMALLSERIAL", "BIGSERIAL", "SERIAL2", "SERIAL4", "SERIAL8"),
+    TEXT: ("TEXT", "CHAR", "CHARACTER", "VARCHAR", "CHARACTER VARYING", "VARYING CHARACTER", "NCHAR",
+           "NATIVE CHARACTER", "NVARCHAR", "CLOB", "TINYTEXT", "MEDIUMTEXT", "LONGTEXT", "CITEXT"),
+    REAL: ("REAL", "FLOAT", "FLOAT4", "FLOAT8", "DOUBLE", "DOUBLE PRECISION"),
+    BOOLEAN: ("BOOLEAN", "BOOL"),
+}
+_TYPE_NAMES = {name: affinity for affinity, names in _AFFINITIES.items() for name in names}
+
+_TYPE_ARGUMENTS = re.compile(r"\(.*?\)")
+
+
+def type_affinity(data_type):
+    # Only known type names get an affinity. Substring rules like SQLite's would
+    # treat PostgreSQL's INTERVAL or POINT as integers.
+    if not data_type:
+        return None
+    declared = " ".join(_TYPE_ARGUMENTS.sub(" ", data_type.upper()).split())
+    if declared.endswith(" UNSIGNED"):
+        declared = declared[:-len(" UNSIGNED")]
+    return _TYPE_NAMES.get(declared)
+
+
+def type_adapter(data_type):
+    return _ADAPTERS.get(type_affinity(data_type))
@@ -0,0 +1,58 @@
+import itertools
+
+
+class _RowCounter:
+    def __init__(self, rows):
+        self._rows = rows
+        self.count = 0
+
+    def __iter__(self):
+        for row in self._rows:
+            self.count += 1
+            yield row
+
+
+class FileWriter:
+    def __init__(self, file):
+        self._file = file
+
+    def write(self, query, rows):
+        counter = _RowCounter(rows)
+        for chunk in query.encode(counter):
+            self._file.write(chunk)
+        return counter.count
+
+
+class SocketWriter:
+    def __init__(self, sock):
+        self._socket = sock
+
+    def write(self, query, rows):
+        counter = _RowCounter(rows)
+        for chunk in query.encode(counter):
+            self._socket.sendall(chunk)
+        return counter.count
+
+
+class SqliteWriter:
+    def __init__(self, connection, batch_size=1000):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self._connection = connection
+        self.batch_size = batch_size
+
+    def write(self, query, rows):
+        # sqlite has no COPY, so rows go through executemany one batch at a time.
+        columns = query.target_columns()
+        names = ", ".join(column.name for column in columns)
+        placeholders = ", ".join("?" * len(columns))
+        sql = f"INSERT INTO {query._table.name} ({names}) VALUES ({placeholders})"
+
+        count = 0
+        rows = iter(query._rows(rows))
+        while True:
+            batch = list(itertools.islice(rows, self.batch_size))
+            if not batch:
+                return count
+            self._connection.executemany(sql, batch)
+            count += len(batch)
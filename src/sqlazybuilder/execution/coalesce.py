@@ -0,0 +1,100 @@
+import asyncio
+import threading
+
+from .executor import build_statement
+
+
+class CoalescingStats:
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def as_dict(self):
+        return {"calls": self.calls, "executions": self.executions, "coalesced": self.coalesced}
+
+
+def _flight_key(sql, params):
+    key = (sql, tuple(params))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _share(result):
+    # Every caller gets its own list so one caller can't mutate another's rows.
+    return list(result) if isinstance(result, list) else result
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, execute, paramstyle="format"):
+        self._execute = execute
+        self.paramstyle = paramstyle
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.stats = CoalescingStats()
+
+    def execute(self, query):
+        sql, params = build_statement(query, self.paramstyle)
+        key = _flight_key(sql, params)
+        with self._lock:
+            self.stats.calls += 1
+            flight = None if key is None else self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                if key is not None:
+                    self._flights[key] = flight
+                self.stats.executions += 1
+            else:
+                self.stats.coalesced += 1
+
+        if leader:
+            try:
+                flight.result = self._execute(sql, params)
+            except BaseException as error:
+                flight.error = error
+            finally:
+                with self._lock:
+                    if key is not None:
+                        del self._flights[key]
+                flight.done.set()
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return _share(flight.result)
+
+
+class AsyncSingleFlight:
+    def __init__(self, execute, paramstyle="format"):
+        self._execute = execute
+        self.paramstyle = paramstyle
+        self._flights = {}
+        self.stats = CoalescingStats()
+
+    async def execute(self, query):
+        sql, params = build_statement(query, self.paramstyle)
+        key = _flight_key(sql, params)
+        self.stats.calls += 1
+        flight = None if key is None else self._flights.get(key)
+        if flight is None:
+            self.stats.executions += 1
+            flight = asyncio.ensure_future(self._execute(sql, params))
+            if key is not None:
+                self._flights[key] = flight
+                flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            self.stats.coalesced += 1
+        # Shielded so a cancelled caller doesn't cancel the shared execution.
+        return _share(await asyncio.shield(flight))
@@ -0,0 +1,98 @@
+import array
+
+from ..core.types import type_affinity, INTEGER, REAL
+from .executor import execute, column_names
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+INT_TYPECODE = "q"
+FLOAT_TYPECODE = "d"
+
+_TYPECODES = {INTEGER: INT_TYPECODE, REAL: FLOAT_TYPECODE}
+_NUMPY_DTYPES = {INT_TYPECODE: "int64", FLOAT_TYPECODE: "float64"}
+
+
+def _declared_typecode(expression):
+    return _TYPECODES.get(type_affinity(getattr(expression, "data_type", None)))
+
+
+def _inferred_typecode(values):
+    typecode = None
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        if isinstance(value, float):
+            typecode = FLOAT_TYPECODE
+        elif typecode is None:
+            typecode = INT_TYPECODE
+    return typecode
+
+
+class ColumnBuffer:
+    def __init__(self, typecode=None):
+        self.typecode = typecode
+        self.data = array.array(typecode) if typecode else []
+
+    def extend(self, values):
+        if self.typecode is None:
+            self.data.extend(values)
+            return
+        size = len(self.data)
+        try:
+            self.data.extend(values)
+        except (TypeError, OverflowError):
+            # NULLs or mixed values can't live in a typed array; keep going as a list.
+            del self.data[size:]
+            self.data = self.data.tolist()
+            self.data.extend(values)
+            self.typecode = None
+
+    def finish(self, use_numpy):
+        if not use_numpy:
+            return self.data
+        if self.typecode is None:
+            result = numpy.empty(len(self.data), dtype=object)
+            result[:] = self.data
+            return result
+        if not self.data:
+            return numpy.empty(0, dtype=_NUMPY_DTYPES[self.typecode])
+        return numpy.frombuffer(self.data, dtype=_NUMPY_DTYPES[self.typecode])
+
+
+def fetch_columns(cursor, query, batch_size=10000, paramstyle="format", use_numpy=None):
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    elif use_numpy and numpy is None:
+        raise ImportError("NumPy is required for use_numpy=True.")
+
+    declared_columns = getattr(query, "_columns", None)
+    if not declared_columns:
+        execute(cursor, query, paramstyle)
+    names = column_names(query, cursor)
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate result column names {names}; use as_alias() to disambiguate.")
+    if declared_columns:
+        execute(cursor, query, paramstyle)
+
+    declared = [_declared_typecode(column) for column in declared_columns or []]
+    buffers = None
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        columns = list(zip(*rows))
+        if buffers is None:
+            typecodes = declared or [None] * len(names)
+            buffers = [ColumnBuffer(typecode or _inferred_typecode(values))
+                       for typecode, values in zip(typecodes, columns)]
+        for buffer, values in zip(buffers, columns):
+            buffer.extend(values)
+
+    if buffers is None:
+        buffers = [ColumnBuffer(typecode) for typecode in declared or [None] * len(names)]
+    return {name: buffer.finish(use_numpy) for name, buffer in zip(names, buffers)}
@@ -0,0 +1,48 @@
+from ..core.base import BaseQuery
+from ..expressions.columns import Column
+
+PARAMSTYLES = ("format", "qmark", "numeric")
+
+
+def convert_placeholders(sql, paramstyle="format"):
+    if paramstyle == "format":
+        return sql
+    if paramstyle == "qmark":
+        return sql.replace("%s", "?")
+    if paramstyle == "numeric":
+        parts = sql.split("%s")
+        pieces = [parts[0]]
+        for index, part in enumerate(parts[1:], start=1):
+            pieces.append(f":{index}")
+            pieces.append(part)
+        return "".join(pieces)
+    raise ValueError(f"Unsupported paramstyle '{paramstyle}'. Expected one of {', '.join(PARAMSTYLES)}.")
+
+
+def build_statement(query, paramstyle="format"):
+    sql, params = query.build() if isinstance(query, BaseQuery) else query
+    return convert_placeholders(sql, paramstyle), params
+
+
+def execute(cursor, query, paramstyle="format"):
+    sql, params = build_statement(query, paramstyle)
+    cursor.execute(sql, params)
+    return cursor
+
+
+def column_name(expression):
+    alias = getattr(expression, "alias", None)
+    if alias:
+        return alias
+    if isinstance(expression, Column):
+        return expression.name
+    return str(expression)
+
+
+def column_names(query, cursor=None):
+    columns = getattr(query, "_columns", None)
+    if columns:
+        return [column_name(column) for column in columns]
+    if cursor is None or cursor.description is None:
+        raise ValueError("Column names for SELECT * require an executed cursor.")
+    return [description[0] for description in cursor.description]
@@ -0,0 +1,156 @@
+import asyncio
+
+from ..core.base import BaseQuery, Expression
+from ..core.types import type_affinity, INTEGER, REAL, BOOLEAN
+from ..expressions.columns import Column
+from ..expressions.conditions import Condition
+
+
+def _point_lookup(query):
+    # A batchable lookup ends its WHERE clause with `column = value` and has no
+    # clause that would apply per key (LIMIT, OFFSET, GROUP BY, HAVING).
+    if not query._conditions or query._limit or query._offset or query._group_by or query._having_conditions:
+        return None
+    if not query._columns and query._joins:
+        return None
+    condition = query._conditions[-1]
+    if not isinstance(condition, Condition) or condition.operator != "=" or \
+            not isinstance(condition.column, Column) or isinstance(condition.value, (Expression, BaseQuery)):
+        return None
+    return condition.column, condition.value
+
+
+def _derive(query, conditions, columns):
+    derived = query.clone()
+    derived._conditions = tuple(conditions)
+    derived._columns = tuple(columns)
+    derived._invalidate("where")
+    derived._invalidate("select")
+    return derived
+
+
+class _Batch:
+    def __init__(self, base, key_column):
+        self.base = base
+        self.key_column = Column(key_column.table, key_column.name)
+        # Rows are matched to keys with Python equality. That agrees with the
+        # database for numeric columns, whose keys the column has already
+        # adapted; text may be collated and untyped columns may coerce.
+        self.exact = type_affinity(key_column.data_type) in (INTEGER, REAL, BOOLEAN)
+        self.waiters = {}
+
+    def query(self, keys):
+        columns = self.base._columns or (Column(self.key_column.table, "*"),)
+        return _derive(self.base, [*self.base._conditions, self.key_column.in_(list(keys))],
+                       [*columns, self.key_column])
+
+    def point_query(self, key):
+        return _derive(self.base, [*self.base._conditions, self.key_column.eq(key)], self.base._columns)
+
+
+class BatchLoader:
+    def __init__(self, execute, max_batch_size=100, delay=0.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        self._execute = execute
+        self.max_batch_size = max_batch_size
+        self.delay = delay
+        self._pending = {}
+        self._scheduled = None
+        self._tasks = set()
+        self.requested = 0
+        self.executed = 0
+
+    async def load(self, query):
+        self.requested += 1
+        point = _point_lookup(query)
+        if point is not None:
+            key_column, key = point
+            base = _derive(query, query._conditions[:-1], query._columns)
+            base_sql, base_params = base.build()
+            try:
+                shape = (base_sql, tuple(base_params), str(key_column))
+                hash((shape, key))
+            except TypeError:
+                point = None
+        if point is None:
+            self.executed += 1
+            sql, params = query.build()
+            return list(await self._execute(sql, params))
+
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(shape)
+        if batch is None:
+            batch = self._pending[shape] = _Batch(base, key_column)
+            self._schedule(loop)
+        future = batch.waiters.get(key)
+        if future is None:
+            future = batch.waiters[key] = loop.create_future()
+            if len(batch.waiters) >= self.max_batch_size:
+                del self._pending[shape]
+                self._start(loop, batch)
+        # Deduplicated callers share one future; shield it so one caller's
+        # cancellation doesn't cancel the others.
+        return list(await asyncio.shield(future))
+
+    def _schedule(self, loop):
+        if self._scheduled is not None:
+            return
+        if self.delay:
+            self._scheduled = loop.call_later(self.delay, self._dispatch, loop)
+        else:
+            self._scheduled = loop.call_soon(self._dispatch, loop)
+
+    def _dispatch(self, loop):
+        self._scheduled = None
+        pending, self._pending = self._pending, {}
+        for batch in pending.values():
+            self._start(loop, batch)
+
+    def _start(self, loop, batch):
+        keys = list(batch.waiters)
+        for start in range(0, len(keys), self.max_batch_size):
+            task = loop.create_task(self._run(batch, keys[start:start + self.max_batch_size]))
+            # The loop only keeps weak references to tasks.
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch, keys):
+        self.executed += 1
+        sql, params = batch.query(keys).build()
+        try:
+            rows = await self._execute(sql, params)
+        except Exception as error:
+            for key in keys:
+                if not batch.waiters[key].done():
+                    batch.waiters[key].set_exception(error)
+            return
+
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row[-1], []).append(tuple(row[:-1]))
+        # A row whose key wasn't requested means the database matched it to
+        # some key differently, so none of the groups can be trusted.
+        trusted = batch.exact or grouped.keys() <= set(keys)
+        retry = []
+        for key in keys:
+            if batch.waiters[key].done():
+                continue
+            if batch.exact or (trusted and key in grouped):
+                batch.waiters[key].set_result(grouped.get(key, []))
+            else:
+                retry.append(key)
+        # Keys the grouping couldn't resolve run on their own.
+        await asyncio.gather(*[self._run_direct(batch, key) for key in retry])
+
+    async def _run_direct(self, batch, key):
+        self.executed += 1
+        sql, params = batch.point_query(key).build()
+        try:
+            rows = await self._execute(sql, params)
+        except Exception as error:
+            if not batch.waiters[key].done():
+                batch.waiters[key].set_exception(error)
+            return
+        if not batch.waiters[key].done():
+            batch.waiters[key].set_result([tuple(row) for row in rows])
@@ -0,0 +1,532 @@
+import operator
+import re
+from collections.abc import Mapping
+from operator import itemgetter
+
+from ..core.base import BaseQuery, Expression
+from ..core.table import Table
+from ..core.types import type_affinity, INTEGER, REAL, TEXT, BOOLEAN
+from ..expressions.columns import Column
+from ..expressions.conditions import Condition, AndCondition, OrCondition, NotCondition
+from ..expressions.functions import (Function, Count, CountAll, Sum, Avg, Min, Max, Coalesce, Cast,
+                                     CountDistinct, Substring)
+from ..expressions.joins import LeftJoin, RightJoin, FullJoin
+from ..queries.analysis import AGGREGATE_FUNCTIONS, qualifier
+from .executor import column_name
+
+_COMPARISONS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge,
+}
+
+_CASTS = {INTEGER: int, REAL: float, TEXT: str, BOOLEAN: bool}
+
+_SCALAR_FUNCTIONS = {
+    "LOWER": lambda value: value.lower(),
+    "UPPER": lambda value: value.upper(),
+    "LENGTH": len,
+    "ABS": abs,
+}
+
+
+def _like_pattern(pattern, case_sensitive=False):
+    regex = "".join(".*" if char == "%" else "." if char == "_" else re.escape(char) for char in pattern)
+    # SQLite's LIKE folds case for ASCII letters only.
+    return re.compile(regex, re.DOTALL if case_sensitive else re.DOTALL | re.IGNORECASE | re.ASCII)
+
+
+def _storage_class(value):
+    # SQLite orders values of different types as numbers < text < blobs.
+    if isinstance(value, (int, float)):
+        return 0
+    if isinstance(value, str):
+        return 1
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return 2
+    return None
+
+
+def _with_affinity(literal, value):
+    # A literal compared with a column takes on the column's affinity, as in SQLite.
+    if isinstance(literal, str) and isinstance(value, (int, float)):
+        for convert in (int, float):
+            try:
+                return convert(literal)
+            except ValueError:
+                pass
+    elif isinstance(literal, (int, float)) and isinstance(value, str):
+        return str(literal)
+    return literal
+
+
+def _compare(compare, a, b):
+    try:
+        return compare(a, b)
+    except TypeError:
+        pass
+    a_class, b_class = _storage_class(a), _storage_class(b)
+    if a_class is None or b_class is None or a_class == b_class:
+        raise ValueError(f"Cannot compare {a!r} with {b!r} in memory.") from None
+    return compare(a_class, b_class)
+
+
+def _and(predicates):
+    def predicate(row):
+        result = True
+        for inner in predicates:
+            value = inner(row)
+            if value is False:
+                return False
+            if value is None:
+                result = None
+        return result
+    return predicate
+
+
+def _or(predicates):
+    def predicate(row):
+        result = False
+        for inner in predicates:
+            value = inner(row)
+            if value is True:
+                return True
+            if value is None:
+                result = None
+        return result
+    return predicate
+
+
+def _not(inner):
+    def predicate(row):
+        value = inner(row)
+        return None if value is None else not value
+    return predicate
+
+
+def _sort_key(position):
+    # NULLs sort first in ascending order, as in SQLite and MySQL.
+    def key(pair):
+        value = pair[position[0]][position[1]]
+        return (value is not None, value)
+    return key
+
+
+class Layout:
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._positions = {}
+        self._by_name = {}
+        for position, (qualifier, name) in enumerate(self.columns):
+            self._positions.setdefault((qualifier, name), position)
+            self._by_name.setdefault(name, []).append(position)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __add__(self, other):
+        return Layout(self.columns + other.columns)
+
+    def position(self, qualifier, name):
+        position = self._positions.get((qualifier, name))
+        if position is not None:
+            return position
+        candidates = self._by_name.get(name, [])
+        if qualifier is None and len(candidates) == 1:
+            return candidates[0]
+        raise ValueError(f"Unknown column '{qualifier}.{name}'." if qualifier else f"Unknown column '{name}'.")
+
+
+class _Compiler:
+    def __init__(self, engine, layout, aggregates=None):
+        self.engine = engine
+        self.layout = layout
+        # Maps id(aggregate function) to its slot in a grouped row.
+        self.aggregates = aggregates or {}
+
+    def value(self, expression):
+        if not isinstance(expression, Expression):
+            return lambda row: expression
+        if id(expression) in self.aggregates:
+            return itemgetter(self.aggregates[id(expression)])
+        if isinstance(expression, Column):
+            return itemgetter(self.layout.position(qualifier(expression.table), expression.name))
+        if isinstance(expression, AGGREGATE_FUNCTIONS):
+            raise ValueError(f"Aggregate {expression} is not allowed here.")
+        if isinstance(expression, Cast):
+            return self._cast(expression)
+        if isinstance(expression, Coalesce):
+            return self._coalesce(expression)
+        if isinstance(expression, Substring):
+            return self._substring(expression)
+        if isinstance(expression, Function):
+            return self._scalar_function(expression)
+        if isinstance(expression, (Condition, AndCondition, OrCondition, NotCondition)):
+            return self.predicate(expression)
+        raise ValueError(f"Cannot evaluate {type(expression).__name__} in memory.")
+
+    def _cast(self, cast):
+        inner = self.value(cast.expression)
+        convert = _CASTS.get(type_affinity(cast.data_type))
+        if convert is None:
+            return inner
+        return lambda row: None if (value := inner(row)) is None else convert(value)
+
+    def _coalesce(self, function):
+        arguments = [self.value(arg) for arg in function.args]
+
+        def coalesce(row):
+            for argument in arguments:
+                value = argument(row)
+                if value is not None:
+                    return value
+            return None
+        return coalesce
+
+    def _substring(self, function):
+        text, start, *length = [self.value(arg) for arg in function.args]
+
+        def substring(row):
+            value, first = text(row), start(row)
+            if value is None or first is None:
+                return None
+            begin = max(first - 1, 0)
+            if length:
+                return value[begin:max(first - 1 + length[0](row), 0)]
+            return value[begin:]
+        return substring
+
+    def _scalar_function(self, function):
+        implementation = _SCALAR_FUNCTIONS.get(function.function_name.upper())
+        if implementation is None or len(function.args) != 1:
+            raise ValueError(f"Function {function.function_name} is not supported in memory.")
+        argument = self.value(function.args[0])
+        return lambda row: None if (value := argument(row)) is None else implementation(value)
+
+    def predicate(self, condition):
+        if isinstance(condition, AndCondition):
+            return _and([self.predicate(inner) for inner in condition.conditions])
+        if isinstance(condition, OrCondition):
+            return _or([self.predicate(inner) for inner in condition.conditions])
+        if isinstance(condition, NotCondition):
+            return _not(self.predicate(condition.condition))
+        if isinstance(condition, Condition):
+            return self._condition(condition)
+        raise ValueError(f"Cannot evaluate {type(condition).__name__} as a condition in memory.")
+
+    def _condition(self, condition):
+        left = self.value(condition.column)
+        operator_name = condition.operator
+
+        if operator_name in ("IS", "IS NOT") and condition.value == "NULL":
+            is_null = operator_name == "IS"
+            return lambda row: (left(row) is None) == is_null
+
+        if operator_name in ("IN", "NOT IN"):
+            return self._membership(left, condition.value, negate=operator_name == "NOT IN")
+
+        affinity = isinstance(condition.column, Column)
+
+        if operator_name == "BETWEEN":
+            low, high = [self.value(bound) for bound in condition.value]
+            literal_bounds = affinity and not any(isinstance(bound, Expression) for bound in condition.value)
+
+            def between(row):
+                value, lower, upper = left(row), low(row), high(row)
+                if value is None or lower is None or upper is None:
+                    return None
+                if literal_bounds:
+                    lower, upper = _with_affinity(lower, value), _with_affinity(upper, value)
+                return _compare(operator.le, lower, value) and _compare(operator.le, value, upper)
+            return between
+
+        if operator_name in ("LIKE", "NOT LIKE"):
+            return self._like(left, condition.value, negate=operator_name == "NOT LIKE")
+
+        compare = _COMPARISONS.get(operator_name)
+        if compare is None:
+            raise ValueError(f"Operator {operator_name} is not supported in memory.")
+        right = self.value(condition.value)
+        literal = affinity and not isinstance(condition.value, Expression)
+
+        def comparison(row):
+            a, b = left(row), right(row)
+            if a is None or b is None:
+                return None
+            if literal:
+                b = _with_affinity(b, a)
+            return _compare(compare, a, b)
+        return comparison
+
+    def _membership(self, left, values, negate):
+        if isinstance(values, BaseQuery):
+            _, rows = self.engine.execute_relation(values)
+            values = [row[0] for row in rows]
+        elif isinstance(values, Expression):
+            raise ValueError("IN over an expression is not supported in memory.")
+        members = {value for value in values if value is not None}
+        has_null = any(value is None for value in values)
+
+        def membership(row):
+            value = left(row)
+            if value is None:
+                return None
+            if value in members:
+                return not negate
+            return None if has_null else negate
+        return membership
+
+    def _like(self, left, pattern, negate):
+        case_sensitive = self.engine.case_sensitive_like
+        if isinstance(pattern, Expression):
+            pattern_value = self.value(pattern)
+
+            def regex(row):
+                pattern = pattern_value(row)
+                return None if pattern is None else _like_pattern(pattern, case_sensitive)
+        else:
+            compiled = _like_pattern(pattern, case_sensitive)
+
+            def regex(row):
+                return compiled
+
+        def like(row):
+            value, matcher = left(row), regex(row)
+            if value is None or matcher is None:
+                return None
+            return (matcher.fullmatch(value if isinstance(value, str) else str(value)) is not None) != negate
+        return like
+
+
+def _aggregate(function, values):
+    if isinstance(function, CountAll):
+        return len(values)
+    present = [value for value in values if value is not None]
+    if isinstance(function, CountDistinct):
+        return len(set(present))
+    if isinstance(function, Count):
+        return len(present)
+    if not present:
+        return None
+    if isinstance(function, Sum):
+        return sum(present)
+    if isinstance(function, Avg):
+        return sum(present) / len(present)
+    if isinstance(function, Min):
+        return min(present)
+    if isinstance(function, Max):
+        return max(present)
+    raise ValueError(f"Aggregate {function} is not supported in memory.")
+
+
+def _aggregate_argument(function):
+    if isinstance(function, CountAll):
+        return None
+    if isinstance(function, CountDistinct):
+        return function.column
+    return function.args[0]
+
+
+def _find_aggregates(expression, found):
+    if isinstance(expression, AGGREGATE_FUNCTIONS):
+        found.append(expression)
+    elif isinstance(expression, Expression):
+        for value in vars(expression).values():
+            for item in value if isinstance(value, (list, tuple)) else (value,):
+                _find_aggregates(item, found)
+
+
+class MemoryEngine:
+    def __init__(self, tables=None, case_sensitive_like=False):
+        # Defaults to SQLite's LIKE; PostgreSQL's LIKE is case sensitive.
+        self.case_sensitive_like = case_sensitive_like
+        self._tables = {}
+        for name, data in (tables or {}).items():
+            self.register(name, data)
+
+    def register(self, table, data, columns=None):
+        name = table.name if isinstance(table, Table) else table
+        if columns is None and isinstance(table, Table) and table.columns is not None:
+            columns = list(table.columns)
+
+        if isinstance(data, Mapping):
+            names = list(columns or data)
+            rows = list(zip(*[data[column] for column in names]))
+        else:
+            data = list(data)
+            names = list(columns or (data[0] if data else []))
+            rows = [tuple(row.get(column) for column in names) for row in data]
+        self._tables[name] = (names, rows)
+
+    def execute(self, query):
+        _, rows = self.execute_relation(query)
+        return rows
+
+    def execute_dicts(self, query):
+        names, rows = self.execute_relation(query)
+        return [dict(zip(names, row)) for row in rows]
+
+    def execute_relation(self, query):
+        layout, rows = self._source(query._table)
+        for join in query._joins:
+            layout, rows = self._join(layout, rows, join)
+
+        if query._conditions:
+            predicate = _and([_Compiler(self, layout).predicate(condition) for condition in query._conditions])
+            rows = [row for row in rows if predicate(row) is True]
+
+        aggregates = []
+        for expression in (*query._columns, *query._having_conditions):
+            _find_aggregates(expression, aggregates)
+
+        if query._group_by or aggregates:
+            compiler, rows = self._group(query, layout, rows, aggregates)
+        else:
+            compiler = _Compiler(self, layout)
+
+        if query._columns:
+            names = [column_name(column) for column in query._columns]
+            projections = [compiler.value(column) for column in query._columns]
+            pairs = [(row, tuple(projection(row) for projection in projections)) for row in rows]
+        else:
+            names = [name for _, name in layout.columns]
+            pairs = [(row, row[:len(layout)]) for row in rows]
+
+        for order_column, direction in reversed(query._order_by):
+            pairs.sort(key=_sort_key(self._order_position(query, layout, order_column)),
+                       reverse=direction == "DESC")
+
+        result = [output for _, output in pairs]
+        if query._offset:
+            result = result[query._offset:]
+        if query._limit:
+            result = result[:query._limit]
+        return names, result
+
+    def _source(self, source):
+        if isinstance(source, BaseQuery):
+            if not source.alias:
+                raise ValueError("Alias required for subquery in FROM or JOIN clause.")
+            names, rows = self.execute_relation(source)
+            return Layout((source.alias, name) for name in names), rows
+
+        name = source.name if isinstance(source, Table) else source
+        if name not in self._tables:
+            raise ValueError(f"Table '{name}' is not registered with the memory engine.")
+        names, rows = self._tables[name]
+        return Layout((qualifier(source), column) for column in names), rows
+
+    def _join(self, left_layout, left_rows, join):
+        right_layout, right_rows = self._source(join.table)
+        layout = left_layout + right_layout
+        keep_left = isinstance(join, (LeftJoin, FullJoin))
+        keep_right = isinstance(join, (RightJoin, FullJoin))
+
+        left_keys, right_keys, residual = self._equi_keys(join.condition, left_layout, right_layout, layout)
+        if left_keys:
+            left_key = self._key(left_keys)
+            right_key = self._key(right_keys)
+            buckets = {}
+            for index, row in enumerate(right_rows):
+                key = right_key(row)
+                if None not in key:
+                    buckets.setdefault(key, []).append(index)
+
+            def candidates(row):
+                key = left_key(row)
+                return () if None in key else buckets.get(key, ())
+        else:
+            every_row = range(len(right_rows))
+
+            def candidates(row):
+                return every_row
+
+        predicate = _and([_Compiler(self, layout).predicate(condition) for condition in residual])
+        left_padding = (None,) * len(left_layout)
+        right_padding = (None,) * len(right_layout)
+        matched_right = set()
+        rows = []
+        for left_row in left_rows:
+            matched = False
+            for index in candidates(left_row):
+                row = left_row + right_rows[index]
+                if predicate(row) is True:
+                    rows.append(row)
+                    matched = True
+                    matched_right.add(index)
+            if keep_left and not matched:
+                rows.append(left_row + right_padding)
+        if keep_right:
+            rows.extend(left_padding + right_row
+                        for index, right_row in enumerate(right_rows) if index not in matched_right)
+        return layout, rows
+
+    def _equi_keys(self, condition, left_layout, right_layout, layout):
+        parts = list(condition.conditions) if isinstance(condition, AndCondition) else [condition]
+        left_keys, right_keys, residual = [], [], []
+        for part in parts:
+            sides = None
+            if isinstance(part, Condition) and part.operator == "=" and \
+                    isinstance(part.column, Column) and isinstance(part.value, Column):
+                sides = self._sides(part.column, part.value, left_layout, right_layout) or \
+                    self._sides(part.value, part.column, left_layout, right_layout)
+            if sides is None:
+                residual.append(part)
+            else:
+                left_keys.append(sides[0])
+                right_keys.append(sides[1] - len(left_layout))
+        return left_keys, right_keys, residual
+
+    def _sides(self, left_column, right_column, left_layout, right_layout):
+        try:
+            left_position = left_layout.position(qualifier(left_column.table), left_column.name)
+            right_position = right_layout.position(qualifier(right_column.table), right_column.name)
+        except ValueError:
+            return None
+        return left_position, len(left_layout) + right_position
+
+    def _key(self, positions):
+        getter = itemgetter(*positions)
+        if len(positions) == 1:
+            return lambda row: (getter(row),)
+        return getter
+
+    def _group(self, query, layout, rows, aggregates):
+        compiler = _Compiler(self, layout)
+        group_key = [compiler.value(column) for column in query._group_by]
+        groups = {}
+        for row in rows:
+            groups.setdefault(tuple(key(row) for key in group_key), []).append(row)
+        if not groups and not query._group_by:
+            groups[()] = []
+
+        arguments = [None if _aggregate_argument(function) is None else compiler.value(_aggregate_argument(function))
+                     for function in aggregates]
+        padding = (None,) * len(layout)
+        grouped = []
+        for members in groups.values():
+            values = []
+            for function, argument in zip(aggregates, arguments):
+                inputs = members if argument is None else [argument(member) for member in members]
+                values.append(_aggregate(function, inputs))
+            grouped.append((members[0] if members else padding) + tuple(values))
+
+        slots = {id(function): len(layout) + index for index, function in enumerate(aggregates)}
+        compiler = _Compiler(self, layout, slots)
+        if query._having_conditions:
+            predicate = _and([compiler.predicate(condition) for condition in query._having_conditions])
+            grouped = [row for row in grouped if predicate(row) is True]
+        return compiler, grouped
+
+    def _order_position(self, query, layout, order_column):
+        # ORDER BY keeps only the rendered column text, so match it against the
+        # select list first and then against the source columns.
+        for index, column in enumerate(query._columns):
+            if order_column in (str(column), column_name(column)) or \
+                    (getattr(column, "alias", None) and order_column == str(column).rsplit(" AS ", 1)[0]):
+                return (1, index)
+        qualifier, _, name = order_column.rpartition(".")
+        return (0, layout.position(qualifier or None, name))
@@ -0,0 +1,121 @@
+from .executor import build_statement, convert_placeholders
+
+MODES = ("sequential", "multi", "pipeline")
+
+
+class StatementResult:
+    def __init__(self, sql, params):
+        self.sql = sql
+        self.params = params
+        self.rows = None
+        self.error = None
+        self.aborted = False
+
+    @property
+    def ok(self):
+        return self.error is None and not self.aborted
+
+    def __repr__(self):
+        state = "ok" if self.ok else "aborted" if self.aborted else f"error={self.error!r}"
+        return f"StatementResult({self.sql!r}, {state})"
+
+
+def _fetch(cursor):
+    return cursor.fetchall() if cursor.description is not None else []
+
+
+def _fetch_queued(cursor, no_result):
+    # A pipelined result only arrives when it's fetched, and until then the
+    # cursor has no description, so fetch first. Drivers report a statement
+    # without a result set with their plain ProgrammingError; server errors
+    # use more specific subclasses.
+    try:
+        return cursor.fetchall()
+    except Exception as error:
+        if type(error) is no_result and cursor.description is None:
+            return []
+        raise
+
+
+class Pipeline:
+    def __init__(self, connection, paramstyle="format", mode="sequential"):
+        if mode not in MODES:
+            raise ValueError(f"Unsupported pipeline mode '{mode}'. Expected one of {', '.join(MODES)}.")
+        convert_placeholders("", paramstyle)
+        self._connection = connection
+        self.paramstyle = paramstyle
+        self.mode = mode
+        self._statements = []
+
+    def add(self, query):
+        self._statements.append(build_statement(query))
+        return self
+
+    def __len__(self):
+        return len(self._statements)
+
+    def execute(self):
+        statements, self._statements = self._statements, []
+        results = [StatementResult(sql, list(params)) for sql, params in statements]
+        if results:
+            getattr(self, f"_execute_{self.mode}")(results)
+        return results
+
+    def _execute_sequential(self, results):
+        cursor = self._connection.cursor()
+        for result in results:
+            try:
+                cursor.execute(*build_statement((result.sql, result.params), self.paramstyle))
+                result.rows = _fetch(cursor)
+            except Exception as error:
+                result.error = error
+
+    def _execute_multi(self, results):
+        # Placeholders are converted after joining so numeric styles count
+        # across the whole request and line up with the concatenated params.
+        sql = convert_placeholders("; ".join(result.sql for result in results), self.paramstyle)
+        params = [param for result in results for param in result.params]
+        cursor = self._connection.cursor()
+        index = 0
+        try:
+            cursor.execute(sql, params)
+            while index < len(results):
+                results[index].rows = _fetch(cursor)
+                index += 1
+                if index < len(results) and not cursor.nextset():
+                    raise RuntimeError("Driver returned fewer result sets than statements.")
+        except Exception as error:
+            self._fail(results, index, error)
+
+    def _execute_pipeline(self, results):
+        index = 0
+        try:
+            with self._connection.pipeline():
+                cursors = []
+                failure = None
+                for result in results:
+                    try:
+                        cursor = self._connection.cursor()
+                        cursor.execute(*build_statement((result.sql, result.params), self.paramstyle))
+                    except Exception as error:
+                        # Nothing after this statement gets queued, but the ones
+                        # before it were sent and still have results to read.
+                        failure = error
+                        break
+                    cursors.append(cursor)
+                no_result = getattr(self._connection, "ProgrammingError", None)
+                while index < len(cursors):
+                    results[index].rows = _fetch_queued(cursors[index], no_result)
+                    index += 1
+            if failure is not None:
+                raise failure
+        except Exception as error:
+            self._fail(results, index, error)
+
+    def _fail(self, results, index, error):
+        # The statement being read when the driver failed gets the error; the
+        # server discards everything after it in the same request.
+        if index < len(results):
+            results[index].error = error
+        for result in results[index + 1:]:
+            result.aborted = True
@@ -0,0 +1,194 @@
+import argparse
+import hashlib
+import json
+import marshal
+import math
+import re
+import sqlite3
+import struct
+import sys
+import threading
+import time
+
+from ..utils.serializer import encode_constant, decode_constant
+from .executor import build_statement
+
+_LENGTH = struct.Struct("<I")
+_SQL_RECORD = "S"
+_QUERY_RECORD = "Q"
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    # Queries that differ only in how many values an IN list holds share a shape.
+    normalized = _IN_LIST.sub("IN (%s...)", _WHITESPACE.sub(" ", sql.strip()))
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+class QueryRecorder:
+    def __init__(self, file):
+        self._file = file
+        self._lock = threading.Lock()
+        self._sql_ids = {}
+        self.recorded = 0
+        self.skipped = 0
+
+    def record(self, sql, params, elapsed, timestamp=None):
+        try:
+            params = tuple(encode_constant(param) for param in params)
+        except TypeError:
+            # The query has already run; a parameter the log can't hold
+            # shouldn't fail it, so the record is dropped and counted.
+            with self._lock:
+                self.skipped += 1
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            sql_id = self._sql_ids.get(sql)
+            if sql_id is None:
+                sql_id = self._sql_ids[sql] = len(self._sql_ids)
+                self._write((_SQL_RECORD, sql_id, fingerprint(sql), sql))
+            self._write((_QUERY_RECORD, sql_id, params, timestamp, elapsed))
+            self.recorded += 1
+
+    def _write(self, record):
+        data = marshal.dumps(record, 4)
+        self._file.write(_LENGTH.pack(len(data)) + data)
+
+    def execute(self, cursor, query, paramstyle="format"):
+        sql, params = build_statement(query)
+        started = time.perf_counter()
+        cursor.execute(*build_statement((sql, params), paramstyle))
+        self.record(sql, params, time.perf_counter() - started)
+        return cursor
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+
+def read_log(file):
+    statements = {}
+    while True:
+        header = file.read(_LENGTH.size)
+        if len(header) < _LENGTH.size:
+            return
+        (length,) = _LENGTH.unpack(header)
+        data = file.read(length)
+        if len(data) < length:
+            # A writer killed mid-record leaves a truncated tail; stop there.
+            return
+        record = marshal.loads(data)
+        if record[0] == _SQL_RECORD:
+            statements[record[1]] = (record[2], record[3])
+        elif record[0] == _QUERY_RECORD:
+            query_fingerprint, sql = statements[record[1]]
+            params = [decode_constant(param) for param in record[2]]
+            yield query_fingerprint, sql, params, record[3], record[4]
+        else:
+            raise ValueError(f"Unknown record type {record[0]!r} in query log.")
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    # Nearest-rank percentile, so the result is always an observed latency.
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def replay(records, connect, concurrency=1, rate=None, paramstyle="qmark"):
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    if rate is not None and rate <= 0:
+        raise ValueError("rate must be positive.")
+
+    records = iter(records)
+    lock = threading.Lock()
+    timings = {}
+    errors = {}
+    counter = [0]
+    started = time.perf_counter()
+
+    def take():
+        with lock:
+            record = next(records, None)
+            index = counter[0]
+            counter[0] += 1
+        return index, record
+
+    def worker():
+        connection = connect()
+        try:
+            cursor = connection.cursor()
+            while True:
+                index, record = take()
+                if record is None:
+                    return
+                if rate is not None:
+                    delay = started + index / rate - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                query_fingerprint, sql, params = record[:3]
+                began = time.perf_counter()
+                try:
+                    cursor.execute(*build_statement((sql, params), paramstyle))
+                    cursor.fetchall()
+                except Exception:
+                    with lock:
+                        errors[query_fingerprint] = errors.get(query_fingerprint, 0) + 1
+                    continue
+                elapsed = time.perf_counter() - began
+                with lock:
+                    timings.setdefault(query_fingerprint, (sql, []))[1].append(elapsed)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started
+
+    fingerprints = {}
+    for query_fingerprint in {*timings, *errors}:
+        sql, latencies = timings.get(query_fingerprint, (None, []))
+        fingerprints[query_fingerprint] = {
+            "sql": sql,
+            "count": len(latencies),
+            "errors": errors.get(query_fingerprint, 0),
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+        }
+    completed = sum(len(latencies) for _, latencies in timings.values())
+    return {
+        "queries": completed,
+        "errors": sum(errors.values()),
+        "duration": duration,
+        "throughput": completed / duration if duration else 0.0,
+        "fingerprints": fingerprints,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded query log against a sqlite database.")
+    parser.add_argument("log")
+    parser.add_argument("database")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--rate", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.log, "rb") as file:
+        report = replay(read_log(file), lambda: sqlite3.connect(args.database),
+                        concurrency=args.concurrency, rate=args.rate)
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,27 @@
+from src.sqlazybuilder.core.types import type_adapter
 from src.sqlazybuilder.expressions.comparable_expression import ComparableExpression
 
 
 class Column(ComparableExpression):
-    def __init__(self, table, name, alias=None):
+    def __init__(self, table, name, alias=None, data_type=None):
         self.table = table
         self.name = name
         self.alias = alias
+        self.data_type = data_type
+        self._adapter = type_adapter(data_type)
 
-    def __str__(self):
-        column_representation = f"{self.table}.{self.name}"
-        if self.alias:
-            column_representation += f" AS {self.alias}"
-        return column_representation
+    def _render(self, out, params):
+        out.append(f"{self.table}.{self.name} AS {self.alias}" if self.alias else f"{self.table}.{self.name}")
 
-    @property
-    def params(self):
-        return []
+    def adapt(self, value):
+        if self._adapter is None:
+            return value
+        try:
+            return self._adapter(value)
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"Invalid value {value!r} for column {self.table}.{self.name} of type {self.data_type}.") from None
 
     def as_alias(self, alias_name):
-        self.alias = alias_name
-        return self
+        # Declared tables share their Column objects, so aliasing returns a copy.
+        return Column(self.table, self.name, alias_name, self.data_type)
@@ -1,31 +1,44 @@
-from src.sqlazybuilder.core.base import Expression
+from src.sqlazybuilder.core.base import Expression, BaseQuery
 from src.sqlazybuilder.expressions.conditions import Condition
 
 
 class ComparableExpression(Expression):
+    def adapt(self, value):
+        return value
+
+    def _bind(self, value):
+        if value is None or isinstance(value, (Expression, BaseQuery)):
+            return value
+        return self.adapt(value)
+
+    def _bind_all(self, values):
+        if isinstance(values, (list, tuple)):
+            return type(values)(self._bind(value) for value in values)
+        return values
+
     def eq(self, value):
-        return Condition(self, "=", value)
+        return Condition(self, "=", self._bind(value))
 
     def ne(self, value):
-        return Condition(self, "!=", value)
+        return Condition(self, "!=", self._bind(value))
 
     def lt(self, value):
-        return Condition(self, "<", value)
+        return Condition(self, "<", self._bind(value))
 
     def gt(self, value):
-        return Condition(self, ">", value)
+        return Condition(self, ">", self._bind(value))
 
     def lte(self, value):
-        return Condition(self, "<=", value)
+        return Condition(self, "<=", self._bind(value))
 
     def gte(self, value):
-        return Condition(self, ">=", value)
+        return Condition(self, ">=", self._bind(value))
 
     def in_(self, values):
-        return Condition(self, "IN", values)
+        return Condition(self, "IN", self._bind_all(values))
 
     def not_in(self, values):
-        return Condition(self, "NOT IN", values)
+        return Condition(self, "NOT IN", self._bind_all(values))
 
     def like(self, pattern):
         return Condition(self, "LIKE", pattern)
@@ -34,7 +47,7 @@ class ComparableExpression(Expression):
         return Condition(self, "NOT LIKE", pattern)
 
     def between(self, value1, value2):
-        return Condition(self, "BETWEEN", (value1, value2))
+        return Condition(self, "BETWEEN", (self._bind(value1), self._bind(value2)))
 
     def is_null(self):
         return Condition(self, "IS", "NULL")
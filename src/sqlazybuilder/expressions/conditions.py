@@ -1,4 +1,4 @@
-from abc import ABC, abstractmethod
+from abc import ABC
 from ..core.base import Expression, BaseQuery
 
 
@@ -12,35 +12,30 @@ class Condition(Expression):
             raise ValueError(
                 "Values for 'IN' or 'NOT IN' condition must be in a list, tuple, an Expression or BaseQuery.")
 
-    def __str__(self):
-        if isinstance(self.value, Expression):
-            return f"{self.column} {self.operator} {self.value}"
-        elif isinstance(self.value, BaseQuery):
-            subquery_str, _ = self.value.build()
-            return f"{self.column} {self.operator} ({subquery_str})"
+    def _render(self, out, params):
+        value = self.value
+        out.append(f"{self.column} {self.operator}")
+        if isinstance(value, Expression):
+            out.append(" ")
+            value._render(out, params)
+        elif isinstance(value, BaseQuery):
+            out.append(" (")
+            value._render(out, params)
+            out.append(")")
+        elif self.operator in ["IS", "IS NOT"] and value == "NULL":
+            out.append(" NULL")
         elif self.operator == "BETWEEN":
-            return f"{self.column} {self.operator} %s AND %s"
-        elif self.operator in ["IS", "IS NOT"] and self.value == "NULL":
-            return f"{self.column} {self.operator} NULL"
-        elif isinstance(self.value, (list, tuple)):
-            placeholders = ", ".join(["%s"] * len(self.value))
-            return f"{self.column} {self.operator} ({placeholders})"
+            out.append(" %s AND %s")
+            if isinstance(value, (list, tuple)):
+                params.extend(value)
+            else:
+                params.append(value)
+        elif isinstance(value, (list, tuple)):
+            out.append(" (" + ", ".join(["%s"] * len(value)) + ")")
+            params.extend(value)
         else:
-            return f"{self.column} {self.operator} %s"
-
-    @property
-    def params(self):
-        if isinstance(self.value, Expression):
-            return self.value.params
-        elif isinstance(self.value, BaseQuery):
-            _, subquery_params = self.value.build()
-            return subquery_params
-        elif self.operator in ["IS", "IS NOT"] and self.value == "NULL":
-            return []
-        elif isinstance(self.value, (list, tuple)):
-            return list(self.value)
-        else:
-            return [self.value]
+            out.append(" %s")
+            params.append(value)
 
     def __and__(self, other):
         return AndCondition(self, other)
@@ -53,19 +48,18 @@ class Condition(Expression):
 
 
 class CombinedCondition(Expression, ABC):
+    separator = None
+
     def __init__(self, *conditions):
         self.conditions = conditions
 
-    @abstractmethod
-    def __str__(self):
-        pass
-
-    @property
-    def params(self):
-        params = []
-        for condition in self.conditions:
-            params.extend(condition.params)
-        return params
+    def _render(self, out, params):
+        out.append("(")
+        for index, condition in enumerate(self.conditions):
+            if index:
+                out.append(self.separator)
+            condition._render(out, params)
+        out.append(")")
 
     def __and__(self, other):
         return AndCondition(self, other)
@@ -78,22 +72,48 @@ class CombinedCondition(Expression, ABC):
 
 
 class AndCondition(CombinedCondition):
-    def __str__(self):
-        return "(" + " AND ".join(map(str, self.conditions)) + ")"
+    separator = " AND "
 
 
 class OrCondition(CombinedCondition):
-    def __str__(self):
-        return "(" + " OR ".join(map(str, self.conditions)) + ")"
+    separator = " OR "
 
 
 class NotCondition(Expression):
     def __init__(self, condition):
         self.condition = condition
 
-    def __str__(self):
-        return "NOT (" + str(self.condition) + ")"
+    def _render(self, out, params):
+        out.append("NOT (")
+        self.condition._render(out, params)
+        out.append(")")
+
+
+class Exists(Expression):
+    def __init__(self, subquery, negated=False):
+        if not isinstance(subquery, BaseQuery):
+            raise ValueError("EXISTS requires a subquery.")
+        self.subquery = subquery
+        self.negated = negated
+
+    def _render(self, out, params):
+        out.append("NOT EXISTS (" if self.negated else "EXISTS (")
+        self.subquery._render(out, params)
+        out.append(")")
+
+    def __and__(self, other):
+        return AndCondition(self, other)
+
+    def __or__(self, other):
+        return OrCondition(self, other)
+
+    def __invert__(self):
+        return Exists(self.subquery, not self.negated)
+
+
+def exists(subquery):
+    return Exists(subquery)
+
 
-    @property
-    def params(self):
-        return self.condition.params
+def not_exists(subquery):
+    return Exists(subquery, negated=True)
@@ -1,3 +1,5 @@
+import copy
+
 from src.sqlazybuilder.core.base import Expression
 from src.sqlazybuilder.expressions.comparable_expression import ComparableExpression
 
@@ -8,27 +10,22 @@ class Function(ComparableExpression):
         self.args = args
         self.alias = None
 
-    def __str__(self):
-        arguments = ', '.join([str(arg) if isinstance(
-            arg, Expression) else "%s" for arg in self.args])
-        function_representation = f"{self.function_name}({arguments})"
-        if self.alias:
-            function_representation += f" AS {self.alias}"
-        return function_representation
-
     def as_alias(self, alias_name):
-        self.alias = alias_name
-        return self
-
-    @property
-    def params(self):
-        params = []
-        for arg in self.args:
+        aliased = copy.copy(self)
+        aliased.alias = alias_name
+        return aliased
+
+    def _render(self, out, params):
+        out.append(f"{self.function_name}(")
+        for index, arg in enumerate(self.args):
+            if index:
+                out.append(", ")
             if isinstance(arg, Expression):
-                params.extend(arg.params)
+                arg._render(out, params)
             else:
+                out.append("%s")
                 params.append(arg)
-        return params
+        out.append(f") AS {self.alias}" if self.alias else ")")
 
 
 class Count(Function):
@@ -40,12 +37,8 @@ class CountAll(Function):
     def __init__(self):
         pass
 
-    def __str__(self):
-        return "COUNT(*)"
-
-    @property
-    def params(self):
-        return []
+    def _render(self, out, params):
+        out.append("COUNT(*)")
 
 
 class Sum(Function):
@@ -78,32 +71,28 @@ class Cast(Function):
         self.expression = expression
         self.data_type = data_type
 
-    def __str__(self):
-        expression_str = str(self.expression) if isinstance(
-            self.expression, Expression) else "%s"
-        return f"CAST({expression_str} AS {self.data_type})"
-
-    @property
-    def params(self):
+    def _render(self, out, params):
+        out.append("CAST(")
         if isinstance(self.expression, Expression):
-            return self.expression.params
-        return [self.expression]
+            self.expression._render(out, params)
+        else:
+            out.append("%s")
+            params.append(self.expression)
+        out.append(f" AS {self.data_type})")
 
 
 class CountDistinct(Function):
     def __init__(self, column):
         self.column = column
 
-    def __str__(self):
-        column_str = str(self.column) if isinstance(
-            self.column, Expression) else "%s"
-        return f"COUNT(DISTINCT {column_str})"
-
-    @property
-    def params(self):
+    def _render(self, out, params):
+        out.append("COUNT(DISTINCT ")
         if isinstance(self.column, Expression):
-            return self.column.params
-        return [self.column]
+            self.column._render(out, params)
+        else:
+            out.append("%s")
+            params.append(self.column)
+        out.append(")")
 
 
 class Substring(Function):
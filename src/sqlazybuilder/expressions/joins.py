@@ -8,27 +8,22 @@ class Join(Expression, ABC):
         self.table = table_or_subquery
         self.condition = condition
 
-    def __str__(self):
+    def _render(self, out, params):
+        out.append(self._join_type())
         if isinstance(self.table, BaseQuery):
             if not self.table.alias:
                 raise ValueError("Alias required for subquery in JOIN clause.")
-            subquery_sql, _ = self.table.build()
-            return f"{self._join_type()} JOIN ({subquery_sql}) AS {self.table.alias} ON {self.condition}"
+            out.append(" JOIN (")
+            self.table._render(out, params)
+            out.append(f") AS {self.table.alias} ON ")
         else:
-            return f"{self._join_type()} JOIN {self.table} ON {self.condition}"
+            out.append(f" JOIN {self.table} ON ")
+        self.condition._render(out, params)
 
     @abstractmethod
     def _join_type(self):
         pass
 
-    @property
-    def params(self):
-        if isinstance(self.table, BaseQuery):
-            _, subquery_params = self.table.build()
-            return subquery_params + self.condition.params
-        else:
-            return self.condition.params
-
 
 class InnerJoin(Join):
     def _join_type(self):
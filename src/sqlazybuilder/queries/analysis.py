@@ -0,0 +1,73 @@
+import re
+
+from ..core.base import BaseQuery, Expression
+from ..core.table import Table
+from ..expressions.columns import Column
+from ..expressions.conditions import Condition, CombinedCondition, NotCondition, Exists
+from ..expressions.functions import Function, Count, CountAll, Sum, Avg, Min, Max, Cast, CountDistinct
+
+AGGREGATE_FUNCTIONS = (Count, CountAll, Sum, Avg, Min, Max, CountDistinct)
+
+_QUALIFIED_NAME = re.compile(r"(\w+)\.(\w+)")
+
+
+def qualifier(table):
+    if isinstance(table, Table):
+        return table.alias or table.name
+    if isinstance(table, BaseQuery):
+        return table.alias
+    if isinstance(table, str) and " AS " in table:
+        return table.split(" AS ", 1)[1]
+    return table
+
+
+def contains_aggregate(expression):
+    if isinstance(expression, AGGREGATE_FUNCTIONS):
+        return True
+    if isinstance(expression, Cast):
+        return contains_aggregate(expression.expression)
+    if isinstance(expression, Function):
+        return any(contains_aggregate(arg) for arg in expression.args)
+    return False
+
+
+def collect_references(expression, references):
+    if isinstance(expression, Column):
+        references.add((qualifier(expression.table), expression.name))
+        return True
+    if isinstance(expression, Condition):
+        if not collect_references(expression.column, references):
+            return False
+        if isinstance(expression.value, BaseQuery):
+            return collect_query_references(expression.value, references)
+        if isinstance(expression.value, Expression):
+            return collect_references(expression.value, references)
+        return True
+    if isinstance(expression, CombinedCondition):
+        return all(collect_references(condition, references) for condition in expression.conditions)
+    if isinstance(expression, NotCondition):
+        return collect_references(expression.condition, references)
+    if isinstance(expression, Exists):
+        return collect_query_references(expression.subquery, references)
+    if isinstance(expression, CountAll):
+        return True
+    if isinstance(expression, Cast):
+        return not isinstance(expression.expression, Expression) or \
+            collect_references(expression.expression, references)
+    if isinstance(expression, CountDistinct):
+        return not isinstance(expression.column, Expression) or \
+            collect_references(expression.column, references)
+    if isinstance(expression, Function):
+        return all(collect_references(arg, references)
+                   for arg in expression.args if isinstance(arg, Expression))
+    return False
+
+
+def collect_query_references(query, references):
+    expressions = [*query._columns, *query._conditions, *query._group_by, *query._having_conditions]
+    expressions.extend(join.condition for join in query._joins)
+    if not all(collect_references(expression, references) for expression in expressions):
+        return False
+    for order_column, _ in query._order_by:
+        references.update(_QUALIFIED_NAME.findall(order_column))
+    return True
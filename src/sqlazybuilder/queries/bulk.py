@@ -0,0 +1,205 @@
+import datetime
+import struct
+from collections.abc import Mapping
+
+from ..core.base import BaseQuery
+
+FORMATS = ("text", "csv", "binary")
+
+BINARY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_BINARY_HEADER = BINARY_SIGNATURE + struct.pack("!ii", 0, 0)
+_BINARY_TRAILER = struct.pack("!h", -1)
+_BINARY_NULL = struct.pack("!i", -1)
+
+_POSTGRES_EPOCH = datetime.datetime(2000, 1, 1)
+_POSTGRES_EPOCH_DATE = _POSTGRES_EPOCH.date()
+_POSTGRES_EPOCH_UTC = _POSTGRES_EPOCH.replace(tzinfo=datetime.timezone.utc)
+
+_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _text_field(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\\\x" + bytes(value).hex()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value).translate(_TEXT_ESCAPES)
+
+
+def _csv_field(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    text = str(value)
+    # An unquoted empty field means NULL, so empty strings are always quoted, and
+    # an unquoted \. on its own line ends the data.
+    if not text or text == "\\." or any(char in text for char in ',"\n\r') or text != text.strip():
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _packer(fmt):
+    packer = struct.Struct(fmt)
+    return lambda value: packer.pack(value)
+
+
+def _encode_text(value):
+    return str(value).encode("utf-8")
+
+
+def _encode_bytes(value):
+    return bytes(value)
+
+
+def _encode_date(value):
+    return struct.pack("!i", (value - _POSTGRES_EPOCH_DATE).days)
+
+
+def _microseconds(delta):
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _encode_timestamp(value):
+    return struct.pack("!q", _microseconds(value - _POSTGRES_EPOCH))
+
+
+def _encode_timestamptz(value):
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return struct.pack("!q", _microseconds(value - _POSTGRES_EPOCH_UTC))
+
+
+_BINARY_ENCODERS = {
+    "smallint": _packer("!h"),
+    "int2": _packer("!h"),
+    "integer": _packer("!i"),
+    "int": _packer("!i"),
+    "int4": _packer("!i"),
+    "bigint": _packer("!q"),
+    "int8": _packer("!q"),
+    "real": _packer("!f"),
+    "float4": _packer("!f"),
+    "double precision": _packer("!d"),
+    "float8": _packer("!d"),
+    "boolean": _packer("!?"),
+    "bool": _packer("!?"),
+    "text": _encode_text,
+    "varchar": _encode_text,
+    "character varying": _encode_text,
+    "bytea": _encode_bytes,
+    "date": _encode_date,
+    "timestamp": _encode_timestamp,
+    "timestamp without time zone": _encode_timestamp,
+    "timestamptz": _encode_timestamptz,
+    "timestamp with time zone": _encode_timestamptz,
+}
+
+
+def _binary_encoder(column):
+    data_type = (column.data_type or "").lower().strip()
+    encoder = _BINARY_ENCODERS.get(data_type) or _BINARY_ENCODERS.get(data_type.split("(")[0].strip())
+    if encoder is None:
+        raise ValueError(
+            f"Binary COPY needs a supported data_type for column '{column.name}', got {column.data_type!r}.")
+    return encoder
+
+
+class CopyQuery(BaseQuery):
+    def __init__(self, table):
+        self._table = table
+        self.alias = None
+        self._columns = ()
+        self._format = "text"
+        self._buffer_size = 1 << 16
+
+    def columns(self, *columns):
+        self._columns += tuple(self._table.column(column) if isinstance(column, str) else column
+                               for column in columns)
+        return self
+
+    def format(self, copy_format):
+        if copy_format not in FORMATS:
+            raise ValueError(f"COPY format must be one of {', '.join(FORMATS)}.")
+        self._format = copy_format
+        return self
+
+    def buffer_size(self, size):
+        if size < 1:
+            raise ValueError("Buffer size must be positive.")
+        self._buffer_size = size
+        return self
+
+    def target_columns(self):
+        if self._columns:
+            return self._columns
+        if getattr(self._table, "columns", None):
+            return tuple(self._table.c)
+        raise ValueError("COPY needs explicit columns or a table with declared columns.")
+
+    def build(self):
+        column_names = ", ".join(column.name for column in self.target_columns())
+        query = f"COPY {self._table.name} ({column_names}) FROM STDIN"
+        if self._format != "text":
+            query += f" WITH (FORMAT {self._format})"
+        return query, []
+
+    def _rows(self, rows):
+        names = [column.name for column in self.target_columns()]
+        name_set = set(names)
+        for number, row in enumerate(rows, 1):
+            if isinstance(row, Mapping):
+                if row.keys() != name_set:
+                    missing = ", ".join(name for name in names if name not in row)
+                    extra = ", ".join(sorted(map(str, row.keys() - name_set)))
+                    raise ValueError(f"Row {number} doesn't match the COPY columns"
+                                     + (f"; missing {missing}" if missing else "")
+                                     + (f"; unknown {extra}" if extra else "") + ".")
+                yield [row[name] for name in names]
+            elif len(row) != len(names):
+                raise ValueError(f"Row {number} has {len(row)} values but COPY targets {len(names)} columns.")
+            else:
+                yield row
+
+    def encode(self, rows):
+        # Rows are pulled lazily and flushed in buffer-sized chunks, so only one
+        # buffer of encoded data is ever held in memory.
+        columns = self.target_columns()
+        buffer = bytearray()
+        size = self._buffer_size
+
+        if self._format == "binary":
+            encoders = [_binary_encoder(column) for column in columns]
+            field_count = struct.pack("!h", len(columns))
+            buffer += _BINARY_HEADER
+            for row in self._rows(rows):
+                buffer += field_count
+                for encoder, value in zip(encoders, row):
+                    if value is None:
+                        buffer += _BINARY_NULL
+                    else:
+                        data = encoder(value)
+                        buffer += struct.pack("!i", len(data))
+                        buffer += data
+                if len(buffer) >= size:
+                    yield bytes(buffer)
+                    buffer.clear()
+            buffer += _BINARY_TRAILER
+        else:
+            field, separator = (_text_field, "\t") if self._format == "text" else (_csv_field, ",")
+            for row in self._rows(rows):
+                buffer += (separator.join([field(value) for value in row]) + "\n").encode("utf-8")
+                if len(buffer) >= size:
+                    yield bytes(buffer)
+                    buffer.clear()
+
+        if buffer:
+            yield bytes(buffer)
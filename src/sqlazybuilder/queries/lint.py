@@ -0,0 +1,183 @@
+import warnings
+
+from ..core.base import BaseQuery, Expression
+from ..core.table import Table
+from ..expressions.columns import Column
+from ..expressions.conditions import Condition, CombinedCondition, NotCondition, Exists
+from ..expressions.functions import Function, Cast, CountDistinct
+from .analysis import collect_references, contains_aggregate, qualifier
+
+MODES = ("warn", "raise")
+RULES = ("cartesian_join", "missing_limit", "large_offset", "leading_wildcard", "function_on_column",
+         "large_in_list", "subquery_depth")
+
+
+class QueryGuardrailWarning(UserWarning):
+    pass
+
+
+class QueryGuardrailError(ValueError):
+    def __init__(self, violations):
+        self.violations = list(violations)
+        super().__init__("; ".join(str(violation) for violation in self.violations))
+
+
+class Violation:
+    def __init__(self, rule, message):
+        self.rule = rule
+        self.message = message
+
+    def __str__(self):
+        return f"{self.rule}: {self.message}"
+
+    def __repr__(self):
+        return f"Violation({self.rule!r}, {self.message!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Violation) and (self.rule, self.message) == (other.rule, other.message)
+
+
+def _column_key(column):
+    if isinstance(column, str):
+        table, _, name = column.rpartition(".")
+        return table, name
+    table = column.table.name if isinstance(column.table, Table) else qualifier(column.table)
+    return table, column.name
+
+
+def _leaf_conditions(condition):
+    if isinstance(condition, CombinedCondition):
+        for inner in condition.conditions:
+            yield from _leaf_conditions(inner)
+    elif isinstance(condition, NotCondition):
+        yield from _leaf_conditions(condition.condition)
+    else:
+        yield condition
+
+
+def _function_columns(expression):
+    # Columns that sit inside a function call and so can't use a plain index.
+    if isinstance(expression, Cast):
+        arguments = (expression.expression,)
+    elif isinstance(expression, CountDistinct):
+        arguments = (expression.column,)
+    elif isinstance(expression, Function):
+        arguments = expression.args
+    else:
+        return
+    for argument in arguments:
+        if isinstance(argument, Column):
+            yield argument
+        else:
+            yield from _function_columns(argument)
+
+
+def _is_query(value):
+    return isinstance(value, BaseQuery) and hasattr(value, "_conditions")
+
+
+def _nested_queries(query):
+    nested = []
+    if _is_query(query._table):
+        nested.append(query._table)
+    for join in query._joins:
+        if _is_query(join.table):
+            nested.append(join.table)
+    conditions = [*query._conditions, *query._having_conditions, *(join.condition for join in query._joins)]
+    for condition in conditions:
+        for leaf in _leaf_conditions(condition):
+            if isinstance(leaf, Exists) and _is_query(leaf.subquery):
+                nested.append(leaf.subquery)
+            elif isinstance(leaf, Condition) and _is_query(leaf.value):
+                nested.append(leaf.value)
+    return nested
+
+
+class QueryLinter:
+    def __init__(self, mode="warn", max_offset=10000, max_in_list=1000, max_subquery_depth=3,
+                 indexed_columns=None, disabled=()):
+        if mode not in MODES:
+            raise ValueError(f"Unsupported lint mode '{mode}'. Expected one of {', '.join(MODES)}.")
+        unknown = set(disabled) - set(RULES)
+        if unknown:
+            raise ValueError(f"Unknown lint rules: {', '.join(sorted(unknown))}.")
+        self.mode = mode
+        self.max_offset = max_offset
+        self.max_in_list = max_in_list
+        self.max_subquery_depth = max_subquery_depth
+        self.indexed_columns = None if indexed_columns is None else {_column_key(column)
+                                                                     for column in indexed_columns}
+        self.disabled = frozenset(disabled)
+
+    def check(self, query):
+        violations = list(self._check_limit(query))
+        self._check_query(query, 0, violations)
+        return [violation for violation in violations if violation.rule not in self.disabled]
+
+    def lint(self, query):
+        violations = self.check(query)
+        if violations and self.mode == "raise":
+            raise QueryGuardrailError(violations)
+        for violation in violations:
+            warnings.warn(str(violation), QueryGuardrailWarning, stacklevel=2)
+        return violations
+
+    def _check_query(self, query, depth, violations):
+        if depth > self.max_subquery_depth:
+            violations.append(Violation(
+                "subquery_depth", f"subqueries are nested {depth} deep; the limit is {self.max_subquery_depth}"))
+            return
+
+        if query._offset is not None and self.max_offset is not None and query._offset > self.max_offset:
+            violations.append(Violation(
+                "large_offset", f"OFFSET {query._offset} exceeds {self.max_offset}; use keyset pagination"))
+
+        violations.extend(self._check_joins(query))
+        for condition in query._conditions:
+            violations.extend(self._check_condition(condition, where=True))
+        for condition in [*query._having_conditions, *(join.condition for join in query._joins)]:
+            violations.extend(self._check_condition(condition, where=False))
+
+        for nested in _nested_queries(query):
+            self._check_query(nested, depth + 1, violations)
+
+    def _check_limit(self, query):
+        if query._limit is not None or query._conditions or query._group_by:
+            return
+        # A select list of only aggregates returns one row no matter how big the table is.
+        if query._columns and all(contains_aggregate(column) for column in query._columns):
+            return
+        yield Violation("missing_limit", f"unbounded scan of {qualifier(query._table)} without WHERE or LIMIT")
+
+    def _check_joins(self, query):
+        seen = {qualifier(query._table)}
+        for join in query._joins:
+            joined = qualifier(join.table)
+            references = set()
+            if collect_references(join.condition, references):
+                qualifiers = {table for table, _ in references}
+                if joined not in qualifiers or not qualifiers & seen:
+                    yield Violation("cartesian_join",
+                                    f"join condition for {joined} does not relate it to {', '.join(sorted(seen))}")
+            seen.add(joined)
+
+    def _check_condition(self, condition, where):
+        for leaf in _leaf_conditions(condition):
+            if not isinstance(leaf, Condition):
+                continue
+            operator = leaf.operator.upper()
+            if operator in ("LIKE", "NOT LIKE", "ILIKE", "NOT ILIKE") and isinstance(leaf.value, str) and \
+                    leaf.value.startswith("%"):
+                yield Violation("leading_wildcard", f"{leaf.column} {operator} '{leaf.value}' cannot use an index")
+            if operator in ("IN", "NOT IN") and isinstance(leaf.value, (list, tuple)) and \
+                    self.max_in_list is not None and len(leaf.value) > self.max_in_list:
+                yield Violation("large_in_list",
+                                f"{leaf.column} {operator} has {len(leaf.value)} values; the limit is "
+                                f"{self.max_in_list}")
+            if where:
+                sides = [leaf.column, leaf.value] if isinstance(leaf.value, Expression) else [leaf.column]
+                for side in sides:
+                    for column in _function_columns(side):
+                        if self.indexed_columns is None or _column_key(column) in self.indexed_columns:
+                            yield Violation("function_on_column",
+                                            f"{side} wraps {column} in a function, which prevents index use")
@@ -0,0 +1,308 @@
+import re
+
+from ..core.base import BaseQuery, Expression
+from ..expressions.columns import Column
+from ..expressions.conditions import Condition, AndCondition, OrCondition, CombinedCondition, NotCondition, Exists
+from ..expressions.joins import InnerJoin, RightJoin, FullJoin
+from .analysis import collect_query_references, collect_references, contains_aggregate, qualifier
+
+# Which form of subquery predicate each dialect's planner handles best.
+SUBQUERY_PREFERENCES = {
+    "mysql": "exists",
+    "postgresql": "exists",
+    "sqlite": "in",
+}
+
+
+def optimize(query):
+    push_down_predicates(query)
+    prune_columns(query)
+    for subquery in _derived_subqueries(query):
+        _replace_subquery(query, subquery, optimize(subquery.clone()))
+    return query
+
+
+def push_down_predicates(query):
+    for subquery in _pushable_subqueries(query):
+        if not _accepts_predicates(subquery):
+            continue
+
+        remaining = []
+        pushed = []
+        for condition in query._conditions:
+            parts = list(_conjuncts(condition))
+            rewritten = [_rewrite(part, subquery) for part in parts]
+            if all(inner is None for inner in rewritten):
+                remaining.append(condition)
+                continue
+            for part, inner in zip(parts, rewritten):
+                if inner is None:
+                    remaining.append(part)
+                else:
+                    pushed.append(inner)
+
+        if pushed:
+            query._conditions = tuple(remaining)
+            query._invalidate("where")
+            _replace_subquery(query, subquery, subquery.clone().where(*pushed))
+    return query
+
+
+def prune_columns(query):
+    # SELECT * exposes every column of the derived tables, so nothing is unused.
+    if not query._columns:
+        return query
+
+    references = set()
+    if not collect_query_references(query, references):
+        return query
+
+    for subquery in _derived_subqueries(query):
+        if not subquery._columns:
+            continue
+        used = {name for table, name in references if table == subquery.alias}
+        # alias.* exposes every output column.
+        if "*" in used:
+            continue
+        # The subquery's own ORDER BY may refer to its output aliases.
+        for order_column, _ in subquery._order_by:
+            used.update(re.findall(r"\w+", order_column))
+
+        kept = [column for column in subquery._columns if _output_name(column) in used]
+        if not kept:
+            kept = subquery._columns[:1]
+        if len(kept) < len(subquery._columns):
+            pruned = subquery.clone()
+            pruned._columns = tuple(kept)
+            pruned._invalidate("select")
+            _replace_subquery(query, subquery, pruned)
+    return query
+
+
+def _derived_subqueries(query):
+    subqueries = []
+    if isinstance(query._table, BaseQuery):
+        subqueries.append(query._table)
+    for join in query._joins:
+        if isinstance(join.table, BaseQuery):
+            subqueries.append(join.table)
+    return subqueries
+
+
+def _replace_subquery(query, subquery, replacement):
+    # The same subquery object may be embedded in other queries, or shared with
+    # the query this one was cloned from, so rewrites go to a clone that is
+    # swapped in here instead of changing the original.
+    if query._table is subquery:
+        query._table = replacement
+        query._invalidate("from")
+    if any(join.table is subquery for join in query._joins):
+        query._joins = tuple(type(join)(replacement, join.condition) if join.table is subquery else join
+                             for join in query._joins)
+        query._invalidate("joins")
+
+
+def _pushable_subqueries(query):
+    # RIGHT and FULL joins null-extend everything to their left, so filtering
+    # before the join would change which rows get padded with NULLs.
+    if any(isinstance(join, (RightJoin, FullJoin)) for join in query._joins):
+        return []
+
+    subqueries = []
+    if isinstance(query._table, BaseQuery):
+        subqueries.append(query._table)
+    for join in query._joins:
+        if isinstance(join, InnerJoin) and isinstance(join.table, BaseQuery):
+            subqueries.append(join.table)
+    return subqueries
+
+
+def _accepts_predicates(subquery):
+    if subquery._limit is not None or subquery._offset is not None:
+        return False
+    if subquery._group_by or subquery._having_conditions:
+        return False
+    return not any(contains_aggregate(column) for column in subquery._columns)
+
+
+def _conjuncts(condition):
+    if isinstance(condition, AndCondition):
+        for inner in condition.conditions:
+            yield from _conjuncts(inner)
+    else:
+        yield condition
+
+
+def _output_name(expression):
+    alias = getattr(expression, "alias", None)
+    if alias:
+        return alias
+    if isinstance(expression, Column):
+        return expression.name
+    return None
+
+
+def _resolve(column, subquery):
+    if not subquery._columns:
+        if subquery._joins:
+            return None
+        return Column(qualifier(subquery._table), column.name)
+
+    matches = [expression for expression in subquery._columns
+               if _output_name(expression) == column.name]
+    if len(matches) != 1 or not isinstance(matches[0], Column):
+        return None
+    return Column(matches[0].table, matches[0].name, data_type=matches[0].data_type)
+
+
+def _rewrite(expression, subquery):
+    if isinstance(expression, Column):
+        if qualifier(expression.table) != subquery.alias:
+            return None
+        return _resolve(expression, subquery)
+
+    if isinstance(expression, Condition):
+        if isinstance(expression.value, BaseQuery):
+            return None
+        column = _rewrite(expression.column, subquery)
+        if column is None:
+            return None
+        value = expression.value
+        if isinstance(value, Expression):
+            value = _rewrite(value, subquery)
+            if value is None:
+                return None
+        return Condition(column, expression.operator, value)
+
+    if isinstance(expression, CombinedCondition):
+        conditions = [_rewrite(condition, subquery) for condition in expression.conditions]
+        if any(condition is None for condition in conditions):
+            return None
+        return type(expression)(*conditions)
+
+    if isinstance(expression, NotCondition):
+        condition = _rewrite(expression.condition, subquery)
+        return None if condition is None else NotCondition(condition)
+
+    return None
+
+
+def rewrite_subqueries(query, dialect=None, prefer=None, strict_nulls=True):
+    if prefer is None:
+        if dialect not in SUBQUERY_PREFERENCES:
+            raise ValueError(f"Unknown dialect '{dialect}'. Expected one of {', '.join(SUBQUERY_PREFERENCES)}.")
+        prefer = SUBQUERY_PREFERENCES[dialect]
+    if prefer not in ("exists", "in"):
+        raise ValueError("prefer must be 'exists' or 'in'.")
+
+    for attribute, clause in (("_conditions", "where"), ("_having_conditions", "having")):
+        conditions = getattr(query, attribute)
+        rewritten = tuple(_rewrite_subquery_condition(condition, prefer, strict_nulls) for condition in conditions)
+        if any(old is not new for old, new in zip(conditions, rewritten)):
+            setattr(query, attribute, rewritten)
+            query._invalidate(clause)
+
+    for subquery in _derived_subqueries(query):
+        _replace_subquery(query, subquery,
+                          rewrite_subqueries(subquery.clone(), prefer=prefer, strict_nulls=strict_nulls))
+    return query
+
+
+def _rewrite_subquery_condition(condition, prefer, strict_nulls):
+    if isinstance(condition, CombinedCondition):
+        conditions = [_rewrite_subquery_condition(inner, prefer, strict_nulls) for inner in condition.conditions]
+        if all(old is new for old, new in zip(condition.conditions, conditions)):
+            return condition
+        return type(condition)(*conditions)
+
+    if isinstance(condition, NotCondition):
+        # Rewrites are only safe in AND/OR chains, where NULL and FALSE both
+        # reject the row. A NOT turns NULL into NULL but FALSE into TRUE.
+        return condition
+
+    if prefer == "exists" and isinstance(condition, Condition) and condition.operator in ("IN", "NOT IN"):
+        return _in_to_exists(condition, strict_nulls) or condition
+    if prefer == "in" and isinstance(condition, Exists):
+        return _exists_to_in(condition, strict_nulls) or condition
+    return condition
+
+
+def _is_plain_subquery(subquery):
+    # An aggregate without GROUP BY returns one row even when nothing matches.
+    return isinstance(subquery, BaseQuery) and hasattr(subquery, "_conditions") and \
+        subquery._limit is None and subquery._offset is None and \
+        not subquery._group_by and not subquery._having_conditions and \
+        not any(contains_aggregate(column) for column in subquery._columns)
+
+
+def _subquery_sources(subquery):
+    sources = {qualifier(subquery._table)}
+    sources.update(qualifier(join.table) for join in subquery._joins)
+    return sources
+
+
+def _in_to_exists(condition, strict_nulls):
+    subquery = condition.value
+    if not _is_plain_subquery(subquery) or len(subquery._columns) != 1 or \
+            not isinstance(subquery._columns[0], Column):
+        return None
+
+    # The outer value must not name a table the subquery also reads, or the
+    # correlation would bind to the inner table instead.
+    outer = condition.column
+    references = set()
+    if not collect_references(outer, references) or \
+            any(table in _subquery_sources(subquery) for table, _ in references):
+        return None
+
+    selected = subquery._columns[0]
+    inner = Column(selected.table, selected.name, data_type=selected.data_type)
+    correlation = Condition(inner, "=", outer)
+    negated = condition.operator == "NOT IN"
+    if negated and strict_nulls:
+        # NOT IN yields no rows once the subquery produces a NULL or the outer
+        # value is NULL; keep that behaviour in the anti-join.
+        correlation = OrCondition(correlation, Condition(inner, "IS", "NULL"), Condition(outer, "IS", "NULL"))
+
+    rewritten = subquery.clone().where(correlation)
+    return Exists(rewritten, negated=negated)
+
+
+def _exists_to_in(condition, strict_nulls):
+    # NOT EXISTS and NOT IN disagree whenever NULLs are involved, so that
+    # direction is only taken when the caller accepts NOT IN's NULL semantics.
+    if condition.negated and strict_nulls:
+        return None
+    subquery = condition.subquery
+    if not _is_plain_subquery(subquery):
+        return None
+
+    sources = _subquery_sources(subquery)
+    correlation = None
+    remaining = []
+    for part in (part for condition in subquery._conditions for part in _conjuncts(condition)):
+        references = set()
+        if not collect_references(part, references):
+            return None
+        if all(table in sources for table, _ in references):
+            remaining.append(part)
+            continue
+        if correlation is not None or not isinstance(part, Condition) or part.operator != "=" or \
+                not isinstance(part.column, Column) or not isinstance(part.value, Column):
+            return None
+        if qualifier(part.column.table) in sources and qualifier(part.value.table) not in sources:
+            correlation = (part.column, part.value)
+        elif qualifier(part.value.table) in sources and qualifier(part.column.table) not in sources:
+            correlation = (part.value, part.column)
+        else:
+            return None
+
+    if correlation is None:
+        return None
+    inner, outer = correlation
+    rewritten = subquery.clone()
+    rewritten._columns = (inner,)
+    rewritten._conditions = tuple(remaining)
+    rewritten._invalidate("select")
+    rewritten._invalidate("where")
+    return Condition(outer, "NOT IN" if condition.negated else "IN", rewritten)
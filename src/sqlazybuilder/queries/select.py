@@ -1,132 +1,296 @@
-from ..core.base import BaseQuery
+import threading
+from collections.abc import Sequence
+from itertools import islice
+
+from ..core.base import BaseQuery, Expression
 from ..expressions.joins import InnerJoin, LeftJoin, RightJoin, FullJoin
 from ..expressions.columns import Column
 
+_APPEND_LOCK = threading.Lock()
+
+
+class ClauseList(Sequence):
+    # An immutable sequence backed by an append-only list that clones share.
+    # Each ClauseList sees its own prefix of the list, so appending to the
+    # newest one extends the shared list in place, and only appending to an
+    # older one (a branch) copies its prefix.
+    __slots__ = ("_items", "_length")
+
+    def __init__(self, items=(), _length=None):
+        self._items = items if _length is not None else list(items)
+        self._length = len(self._items) if _length is None else _length
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return islice(self._items, self._length)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("clause index out of range")
+        return self._items[index]
+
+    def __add__(self, other):
+        with _APPEND_LOCK:
+            items = self._items
+            if len(items) != self._length:
+                items = items[:self._length]
+            items.extend(other)
+            return ClauseList(items, len(items))
+
+    def __radd__(self, other):
+        return ClauseList([*other, *self])
+
+    def __eq__(self, other):
+        if isinstance(other, (ClauseList, tuple, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return f"ClauseList({list(self)!r})"
+
+
+def _extend(items, new):
+    # Optimizer passes may assign plain tuples; they become ClauseLists again
+    # on the next append.
+    return (items if isinstance(items, ClauseList) else ClauseList(items)) + new
+
 
 class SelectQuery(BaseQuery):
     def __init__(self, table_or_subquery, alias=None):
         self._table = table_or_subquery
         self.alias = alias
-        self._columns = []
-        self._conditions = []
-        self._order_by = []
+        # Clause lists are ClauseLists so clones share them without copying.
+        self._columns = ClauseList()
+        self._conditions = ClauseList()
+        self._order_by = ClauseList()
         self._limit = None
         self._offset = None
-        self._joins = []
-        self._group_by = []
-        self._having_conditions = []
+        self._joins = ClauseList()
+        self._group_by = ClauseList()
+        self._having_conditions = ClauseList()
+        self._reset_cache()
 
     def as_alias(self, alias_name):
         self.alias = alias_name
         return self
 
+    def clone(self):
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone._clauses = dict(self._clauses)
+        clone._fragments = dict(self._fragments)
+        return clone
+
     def column(self, column_name):
         return Column(self.alias, column_name) if self.alias else Column(str(self._table), column_name)
 
     def select(self, *columns):
-        self._columns.extend(columns)
+        self._columns = _extend(self._columns, columns)
+        self._invalidate("select")
         return self
 
     def where(self, *conditions):
-        self._conditions.extend(conditions)
+        self._conditions = _extend(self._conditions, conditions)
+        self._invalidate("where")
         return self
 
     def order_by(self, column, direction="ASC"):
         if direction.upper() not in ['ASC', 'DESC']:
             raise ValueError("Order direction must be 'ASC' or 'DESC'")
-        self._order_by.append((str(column), direction.upper()))
+        self._order_by = _extend(self._order_by, ((str(column), direction.upper()),))
+        self._invalidate("order_by")
         return self
 
     def limit(self, limit):
         self._limit = limit
+        self._invalidate("limit")
         return self
 
     def offset(self, offset):
         self._offset = offset
+        self._invalidate("offset")
         return self
 
     def inner_join(self, table_or_subquery, condition):
-        self._joins.append(InnerJoin(table_or_subquery, condition))
+        self._joins = _extend(self._joins, (InnerJoin(table_or_subquery, condition),))
+        self._invalidate("joins")
         return self
 
     def left_join(self, table_or_subquery, condition):
-        self._joins.append(LeftJoin(table_or_subquery, condition))
+        self._joins = _extend(self._joins, (LeftJoin(table_or_subquery, condition),))
+        self._invalidate("joins")
         return self
 
     def right_join(self, table_or_subquery, condition):
-        self._joins.append(RightJoin(table_or_subquery, condition))
+        self._joins = _extend(self._joins, (RightJoin(table_or_subquery, condition),))
+        self._invalidate("joins")
         return self
 
     def full_join(self, table_or_subquery, condition):
-        self._joins.append(FullJoin(table_or_subquery, condition))
+        self._joins = _extend(self._joins, (FullJoin(table_or_subquery, condition),))
+        self._invalidate("joins")
         return self
 
     def group_by(self, *columns):
-        self._group_by.extend(columns)
+        self._group_by = _extend(self._group_by, columns)
+        self._invalidate("group_by")
         return self
 
     def having(self, *conditions):
-        self._having_conditions.extend(conditions)
+        self._having_conditions = _extend(self._having_conditions, conditions)
+        self._invalidate("having")
         return self
 
-    def build(self):
+    def _reset_cache(self):
+        self._clauses = {}
+        self._fragments = {}
+        self._compiled = None
+
+    def _invalidate(self, clause):
+        self._clauses.pop(clause, None)
+
+    def _clause(self, name):
+        entry = self._clauses.get(name)
+        if entry is None or not _dependencies_current(entry[2]):
+            entry = getattr(self, f"_render_{name}")()
+            self._clauses[name] = entry
+        return entry
+
+    def _compile(self):
+        # Each clause is cached as (sql, params, dependencies) and re-rendered only
+        # after its builder method is called or a subquery it embeds has changed.
+        entries = tuple(self._clause(name) for name in CLAUSES)
+        compiled = self._compiled
+        if compiled is not None and all(old is new for old, new in zip(compiled[2], entries)):
+            return compiled
+
+        query = " ".join(entry[0] for entry in entries if entry[0])
+        params = tuple(param for entry in entries for param in entry[1])
+        self._compiled = (query, params, entries)
+        return self._compiled
+
+    def _render_items(self, clause, items, separator):
+        # Items already rendered for this clause are reused, so appending to a
+        # long clause only renders the new items.
+        cached = self._fragments.get(clause, ())
+        fragments = []
+        for index, item in enumerate(items):
+            if index < len(cached) and cached[index][0] is item and _dependencies_current(cached[index][3]):
+                fragments.append(cached[index])
+            elif isinstance(item, Expression):
+                out = []
+                params = []
+                item._render(out, params)
+                fragments.append((item, "".join(out), tuple(params), _dependencies([item])))
+            else:
+                fragments.append((item, str(item), (), ()))
+        self._fragments[clause] = fragments
+
+        sql = separator.join(fragment[1] for fragment in fragments)
+        params = tuple(param for fragment in fragments for param in fragment[2])
+        dependencies = tuple(dependency for fragment in fragments for dependency in fragment[3])
+        return sql, params, dependencies
+
+    def _render_select(self):
         if not self._columns:
-            select_clause = "SELECT *"
-        else:
-            select_clause = f"SELECT {', '.join(map(str, self._columns))}"
+            return "SELECT *", (), ()
+        columns_str, _, dependencies = self._render_items("select", self._columns, ", ")
+        return f"SELECT {columns_str}", (), dependencies
 
+    def _render_from(self):
         # Check if the table is a subquery
         if isinstance(self._table, BaseQuery):
             if not self._table.alias:
                 raise ValueError("Alias required for subquery in FROM clause.")
-            subquery_sql, subquery_params = self._table.build()
-            from_clause = f"FROM ({subquery_sql}) AS {self._table.alias}"
-            params = subquery_params
-        else:
-            from_clause = f"FROM {self._table}"
+            out = ["FROM ("]
             params = []
+            self._table._render(out, params)
+            out.append(f") AS {self._table.alias}")
+            return "".join(out), tuple(params), _dependencies([self._table])
+        return f"FROM {self._table}", (), ()
+
+    def _render_joins(self):
+        if not self._joins:
+            return None, (), ()
+        return self._render_items("joins", self._joins, " ")
+
+    def _render_where(self):
+        if not self._conditions:
+            return None, (), ()
+        conditions_str, params, dependencies = self._render_items("where", self._conditions, " AND ")
+        return f"WHERE {conditions_str}", params, dependencies
+
+    def _render_group_by(self):
+        if not self._group_by:
+            return None, (), ()
+        group_by_str, _, dependencies = self._render_items("group_by", self._group_by, ", ")
+        return f"GROUP BY {group_by_str}", (), dependencies
+
+    def _render_having(self):
+        if not self._having_conditions:
+            return None, (), ()
+        having_str, params, dependencies = self._render_items("having", self._having_conditions, " AND ")
+        return f"HAVING {having_str}", params, dependencies
+
+    def _render_order_by(self):
+        if not self._order_by:
+            return None, (), ()
+        order_by_str = ", ".join([f"{col} {dir}" for col, dir in self._order_by])
+        return f"ORDER BY {order_by_str}", (), ()
+
+    def _render_limit(self):
+        return (f"LIMIT {self._limit}" if self._limit else None), (), ()
+
+    def _render_offset(self):
+        return (f"OFFSET {self._offset}" if self._offset else None), (), ()
+
+    def _render(self, out, params):
+        query, query_params = self._compile()[:2]
+        out.append(query)
+        params.extend(query_params)
+
+    def build(self, frozen=False):
+        # frozen=True hands back the cached params tuple itself instead of a copy.
+        query, params = self._compile()[:2]
+        return (query, params) if frozen else (query, list(params))
+
+
+CLAUSES = ("select", "from", "joins", "where", "group_by", "having", "order_by", "limit", "offset")
+
+
+def _snapshot(query):
+    return query._compile() if isinstance(query, SelectQuery) else query.build()
+
+
+def _dependencies(expressions):
+    found = []
+    stack = list(expressions)
+    while stack:
+        item = stack.pop()
+        if isinstance(item, BaseQuery):
+            # The alias is rendered by the embedding query, so it's part of the snapshot.
+            found.append((item, getattr(item, "alias", None), _snapshot(item)))
+        elif isinstance(item, Expression):
+            stack.extend(vars(item).values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return tuple(found)
+
 
-        query_parts = [select_clause, from_clause]
-
-        join_clause = " ".join([str(join) for join in self._joins])
-        if join_clause:
-            query_parts.append(join_clause)
-            for join in self._joins:
-                params.extend(join.params)
-
-        if self._conditions:
-            conditions_str = " AND ".join(map(str, self._conditions))
-            where_clause = f"WHERE {conditions_str}"
-            query_parts.append(where_clause)
-            for condition in self._conditions:
-                params.extend(condition.params)
-
-        if self._group_by:
-            group_by_str = ", ".join(map(str, self._group_by))
-            group_by_clause = f"GROUP BY {group_by_str}"
-            query_parts.append(group_by_clause)
-
-        if self._having_conditions:
-            having_str = " AND ".join(map(str, self._having_conditions))
-            having_clause = f"HAVING {having_str}"
-            query_parts.append(having_clause)
-            for condition in self._having_conditions:
-                params.extend(condition.params)
-
-        if self._order_by:
-            order_by_str = ", ".join(
-                [f"{col} {dir}" for col, dir in self._order_by])
-            order_clause = f"ORDER BY {order_by_str}"
-            query_parts.append(order_clause)
-
-        if self._limit:
-            limit_clause = f"LIMIT {self._limit}"
-            query_parts.append(limit_clause)
-
-        if self._offset:
-            offset_clause = f"OFFSET {self._offset}"
-            query_parts.append(offset_clause)
-
-        query = " ".join(query_parts)
-
-        return query, params
+def _dependencies_current(dependencies):
+    for query, alias, snapshot in dependencies:
+        if getattr(query, "alias", None) != alias:
+            return False
+        current = _snapshot(query)
+        if current is not snapshot and current != snapshot:
+            return False
+    return True
@@ -1,5 +1,5 @@
 from ..expressions.columns import Column
 
 
-def create_column(table, column_name):
-    return Column(table, column_name)
+def create_column(table, column_name, data_type=None):
+    return Column(table, column_name, data_type=data_type)
@@ -0,0 +1,387 @@
+import array
+import datetime
+import marshal
+import operator
+import sys
+import uuid
+from decimal import Decimal
+from collections import deque
+from itertools import islice, repeat
+
+from ..core.table import Table, ColumnCollection
+from ..core.types import type_adapter
+from ..expressions.columns import Column
+from ..expressions.conditions import Condition, AndCondition, OrCondition, NotCondition, Exists
+from ..expressions.functions import (Function, Count, CountAll, Sum, Avg, Min, Max, Coalesce, Cast,
+                                     CountDistinct, Substring)
+from ..expressions.joins import InnerJoin, LeftJoin, RightJoin, FullJoin
+from ..queries.select import SelectQuery, ClauseList
+
+MAGIC = b"SQLZ"
+FORMAT_VERSION = 3
+# marshal is only stable within one marshal version, so it is part of the header.
+MARSHAL_VERSION = marshal.version
+_HEADER = MAGIC + bytes([FORMAT_VERSION, MARSHAL_VERSION])
+
+# Nodes are stored grouped by class, one column per field. A column holds
+# either node references only, or raw marshal-able values with a few fix-ups
+# for entries that need decoding (references inside containers, dates, ...).
+_REFS = 0
+_RAW = 1
+_REF_TUPLES = 2
+
+# Fix-up entries are (kind, payload) pairs.
+_REF = 0
+_REF_TUPLE = 1
+_REF_LIST = 2
+_TUPLE = 3
+_LIST = 4
+_CONSTANT = 5
+
+# Constants that marshal can't store directly are stored as (tag, payload).
+_DICT = 0
+_DATETIME = 1
+_DATE = 2
+_TIME = 3
+_DECIMAL = 4
+_UUID = 5
+
+_PRIMITIVES = frozenset((type(None), bool, int, float, str, bytes))
+
+_SCALARS = {
+    datetime.datetime: (_DATETIME, datetime.datetime.isoformat, datetime.datetime.fromisoformat),
+    datetime.date: (_DATE, datetime.date.isoformat, datetime.date.fromisoformat),
+    datetime.time: (_TIME, datetime.time.isoformat, datetime.time.fromisoformat),
+    Decimal: (_DECIMAL, str, Decimal),
+    uuid.UUID: (_UUID, str, uuid.UUID),
+}
+_SCALAR_DECODERS = {tag: decode for tag, _, decode in _SCALARS.values()}
+_SCALAR_DECODERS[_DICT] = dict
+
+
+def encode_constant(value):
+    value_type = type(value)
+    if value_type in _PRIMITIVES:
+        return value
+    if value_type in _SCALARS:
+        tag, encode, _ = _SCALARS[value_type]
+        return tag, encode(value)
+    if value_type is dict and all(type(item) in _PRIMITIVES for item in (*value, *value.values())):
+        return _DICT, value
+    raise TypeError(f"Cannot serialize values of type {value_type.__name__}.")
+
+
+def decode_constant(value):
+    if type(value) is tuple:
+        return _SCALAR_DECODERS[value[0]](value[1])
+    return value
+
+
+class NodeSpec:
+    def __init__(self, code, cls, fields, rebuild=None, values=None):
+        self.code = code
+        self.cls = cls
+        self.fields = fields
+        self.rebuild = rebuild
+        getter = operator.attrgetter(*fields)
+        self.values = values or ((lambda node: (getter(node),)) if len(fields) == 1 else getter)
+
+    def field_values(self, node):
+        try:
+            return self.values(node)
+        except AttributeError:
+            # Some nodes never set optional fields such as alias.
+            return tuple(getattr(node, field, None) for field in self.fields)
+
+
+_SPECS_BY_CLASS = {}
+_SPECS_BY_CODE = {}
+
+
+def register_node(code, cls, fields, rebuild=None, values=None):
+    if not 0 < code < 256:
+        raise ValueError("Serialization codes must be between 1 and 255.")
+    if code in _SPECS_BY_CODE and _SPECS_BY_CODE[code].cls is not cls:
+        raise ValueError(f"Serialization code {code} is already used by {_SPECS_BY_CODE[code].cls.__name__}.")
+    spec = NodeSpec(code, cls, tuple(fields), rebuild, values)
+    _SPECS_BY_CLASS[cls] = spec
+    _SPECS_BY_CODE[code] = spec
+
+
+def _rebuild_table(table):
+    table._c = None if table.columns is None else ColumnCollection(table)
+
+
+def _rebuild_column(column):
+    column._adapter = type_adapter(column.data_type)
+
+
+_QUERY_FIELDS = ("_table", "alias", "_columns", "_conditions", "_order_by", "_limit", "_offset", "_joins",
+                 "_group_by", "_having_conditions")
+_query_getter = operator.attrgetter(*_QUERY_FIELDS)
+
+
+def _query_values(query):
+    # Clause lists are written as the tuples they stand for.
+    return tuple(tuple(value) if type(value) is ClauseList else value for value in _query_getter(query))
+
+
+def _rebuild_query(query):
+    query._reset_cache()
+
+
+_FUNCTION_FIELDS = ("function_name", "args", "alias")
+_JOIN_FIELDS = ("table", "condition")
+
+register_node(1, Table, ("name", "alias", "columns"), _rebuild_table)
+register_node(2, Column, ("table", "name", "alias", "data_type"), _rebuild_column)
+register_node(3, Condition, ("column", "operator", "value"))
+register_node(4, AndCondition, ("conditions",))
+register_node(5, OrCondition, ("conditions",))
+register_node(6, NotCondition, ("condition",))
+register_node(7, Function, _FUNCTION_FIELDS)
+register_node(8, Count, _FUNCTION_FIELDS)
+register_node(9, CountAll, ("alias",))
+register_node(10, Sum, _FUNCTION_FIELDS)
+register_node(11, Avg, _FUNCTION_FIELDS)
+register_node(12, Min, _FUNCTION_FIELDS)
+register_node(13, Max, _FUNCTION_FIELDS)
+register_node(14, Coalesce, _FUNCTION_FIELDS)
+register_node(15, Cast, ("expression", "data_type", "alias"))
+register_node(16, CountDistinct, ("column", "alias"))
+register_node(17, Substring, _FUNCTION_FIELDS)
+register_node(18, InnerJoin, _JOIN_FIELDS)
+register_node(19, LeftJoin, _JOIN_FIELDS)
+register_node(20, RightJoin, _JOIN_FIELDS)
+register_node(21, FullJoin, _JOIN_FIELDS)
+register_node(22, SelectQuery, _QUERY_FIELDS, _rebuild_query, _query_values)
+register_node(23, Exists, ("subquery", "negated"))
+
+
+# Array item sizes vary by platform ("L" is 4 bytes on Windows and 8 on
+# Linux), so payloads record the width and each side picks its own typecode.
+_INT_TYPECODES = {}
+for _typecode in "BHILQ":
+    _INT_TYPECODES.setdefault(array.array(_typecode).itemsize, _typecode)
+
+
+def _pack_ints(values):
+    largest = max(values, default=0)
+    width = 1 if largest < 1 << 8 else 2 if largest < 1 << 16 else 4 if largest < 1 << 32 else 8
+    packed = array.array(_INT_TYPECODES[width], values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return width, packed.tobytes()
+
+
+def _unpack_ints(packed):
+    width, data = packed
+    if width not in _INT_TYPECODES:
+        raise ValueError(f"Unsupported integer width {width!r} in serialized query.")
+    values = array.array(_INT_TYPECODES[width])
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _is_raw(value):
+    value_type = type(value)
+    if value_type in _PRIMITIVES:
+        return True
+    if value_type is list or value_type is tuple:
+        return all(_is_raw(item) for item in value)
+    if value_type is dict:
+        return all(type(item) in _PRIMITIVES for item in (*value, *value.values()))
+    return False
+
+
+class _Writer:
+    def __init__(self, root):
+        self.nodes = [root]
+        self.index = {id(root): 0}
+        # Per class code: (node positions, one (raw values, fix-ups) pair per field).
+        self.groups = {}
+
+    def ref(self, node):
+        position = self.index.get(id(node))
+        if position is None:
+            position = self.index[id(node)] = len(self.nodes)
+            self.nodes.append(node)
+        return position
+
+    def fixup(self, value):
+        value_type = type(value)
+        if value_type in _SPECS_BY_CLASS:
+            return _REF, self.ref(value)
+        if value_type is list or value_type is tuple:
+            if value and all(type(item) in _SPECS_BY_CLASS for item in value):
+                return (_REF_TUPLE if value_type is tuple else _REF_LIST), tuple(map(self.ref, value))
+            return (_TUPLE if value_type is tuple else _LIST), tuple(map(self.fixup, value))
+        return _CONSTANT, encode_constant(value)
+
+    def write(self):
+        nodes = self.nodes
+        groups = self.groups
+        specs = _SPECS_BY_CLASS
+        ref = self.ref
+        _spec_for(nodes[0])
+        # Breadth-first over a growing list, so deep trees never recurse.
+        position = 0
+        while position < len(nodes):
+            node = nodes[position]
+            spec = specs[type(node)]
+            group = groups.get(spec.code)
+            if group is None:
+                group = groups[spec.code] = ([], [([], []) for _ in spec.fields])
+            group[0].append(position)
+            for (raw, fixups), value in zip(group[1], spec.field_values(node)):
+                value_type = type(value)
+                if value_type in _PRIMITIVES:
+                    raw.append(value)
+                    continue
+                if value_type in specs:
+                    fixups.append((len(raw), (_REF, ref(value))))
+                elif (value_type is tuple or value_type is list) and value and \
+                        all(type(item) in specs for item in value):
+                    fixups.append((len(raw), (_REF_TUPLE if value_type is tuple else _REF_LIST,
+                                              tuple(map(ref, value)))))
+                elif _is_raw(value):
+                    raw.append(value)
+                    continue
+                else:
+                    fixups.append((len(raw), self.fixup(value)))
+                raw.append(None)
+            position += 1
+
+        # Renumber so each class occupies one contiguous range of indexes;
+        # the reader then creates every object of a class in a single call.
+        remap = [0] * len(self.nodes)
+        offset = 0
+        for positions, _ in self.groups.values():
+            for rank, position in enumerate(positions, offset):
+                remap[position] = rank
+            offset += len(positions)
+
+        groups = tuple((code, len(positions), tuple(_column(raw, fixups, remap) for raw, fixups in columns))
+                       for code, (positions, columns) in self.groups.items())
+        return remap[0], groups
+
+
+def _remap(entry, remap):
+    kind, payload = entry
+    if kind == _REF:
+        return kind, remap[payload]
+    if kind == _REF_TUPLE or kind == _REF_LIST:
+        return kind, tuple(remap[item] for item in payload)
+    if kind == _TUPLE or kind == _LIST:
+        return kind, tuple(_remap(item, remap) for item in payload)
+    return entry
+
+
+def _column(raw, fixups, remap):
+    if len(fixups) == len(raw) and all(entry[0] == _REF for _, entry in fixups):
+        return _REFS, _pack_ints([remap[entry[1]] for _, entry in fixups])
+    # Clause tuples and AND/OR operands are tuples of nodes, possibly empty.
+    tuples = dict(fixups)
+    if len(tuples) == raw.count(None) and all(entry[0] == _REF_TUPLE for entry in tuples.values()) and \
+            all(type(value) is tuple and not value for value in raw if value is not None):
+        payloads = [tuples[position][1] if position in tuples else () for position in range(len(raw))]
+        return (_REF_TUPLES, _pack_ints([len(payload) for payload in payloads]),
+                _pack_ints([remap[item] for payload in payloads for item in payload]))
+    return _RAW, tuple(raw), tuple((position, _remap(entry, remap)) for position, entry in fixups)
+
+
+def _spec_for(node):
+    spec = _SPECS_BY_CLASS.get(type(node))
+    if spec is None:
+        raise TypeError(f"Cannot serialize objects of type {type(node).__name__}.")
+    return spec
+
+
+def _decode(entry, objects):
+    kind, payload = entry
+    if kind == _REF:
+        return objects[payload]
+    if kind == _REF_TUPLE:
+        return tuple(map(objects.__getitem__, payload))
+    if kind == _REF_LIST:
+        return list(map(objects.__getitem__, payload))
+    if kind == _TUPLE:
+        return tuple(_decode(item, objects) for item in payload)
+    if kind == _LIST:
+        return [_decode(item, objects) for item in payload]
+    return decode_constant(payload)
+
+
+def _column_values(column, objects, count):
+    resolve = objects.__getitem__
+    if column[0] == _REFS:
+        return map(resolve, _unpack_ints(column[1]))
+    if column[0] == _REF_TUPLES:
+        lengths = _unpack_ints(column[1])
+        flat = map(resolve, _unpack_ints(column[2]))
+        distinct = set(lengths)
+        if distinct == {0}:
+            return repeat((), count)
+        if len(distinct) == 1:
+            # Equal-length tuples can be cut from the shared iterator by zip.
+            return zip(*repeat(flat, lengths[0]))
+        # Each islice takes the next `length` items off the shared iterator.
+        return map(tuple, map(islice, repeat(flat), lengths))
+    if not column[2]:
+        return column[1]
+    values = list(column[1])
+    for position, entry in column[2]:
+        values[position] = _decode(entry, objects)
+    return values
+
+
+def dumps(node):
+    payload = _Writer(node).write()
+    return _HEADER + marshal.dumps(payload, MARSHAL_VERSION)
+
+
+def loads(data):
+    data = memoryview(data)
+    if len(data) < len(_HEADER) or bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Data is not a serialized SQLazyBuilder query.")
+    version, marshal_version = data[len(MAGIC)], data[len(MAGIC) + 1]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported serialization format version {version}; expected {FORMAT_VERSION}.")
+    if marshal_version != MARSHAL_VERSION:
+        raise ValueError(f"Query was serialized with marshal version {marshal_version}; "
+                         f"this Python uses {MARSHAL_VERSION}.")
+    try:
+        root, groups = marshal.loads(data[len(_HEADER):])
+    except (EOFError, TypeError, ValueError):
+        raise ValueError("Serialized query is truncated or corrupt.") from None
+
+    # Every object exists before any field is filled in, so references are
+    # plain indexes and the order nodes were written in doesn't matter.
+    objects = []
+    for code, count, _ in groups:
+        spec = _SPECS_BY_CODE.get(code)
+        if spec is None:
+            raise ValueError(f"Unknown node code {code} in serialized query.")
+        objects.extend(map(object.__new__, repeat(spec.cls, count)))
+    if not 0 <= root < len(objects):
+        raise ValueError("Serialized query is empty.")
+
+    rebuilt = []
+    start = 0
+    for code, count, columns in groups:
+        spec = _SPECS_BY_CODE[code]
+        nodes = objects[start:start + count]
+        start += count
+        for field, column in zip(spec.fields, columns):
+            # Filling one field across every node of a class keeps the per-node
+            # work inside C-level map/setattr.
+            deque(map(setattr, nodes, repeat(field), _column_values(column, objects, count)), 0)
+        if spec.rebuild is not None:
+            rebuilt.append((spec.rebuild, nodes))
+
+    for rebuild, nodes in rebuilt:
+        for node in nodes:
+            rebuild(node)
+    return objects[root]
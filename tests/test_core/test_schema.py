@@ -0,0 +1,67 @@
+import sqlite3
+import unittest
+from src.sqlazybuilder.core.schema import Schema
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.select import SelectQuery
+
+
+class TestSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = Schema()
+        self.users = self.schema.table("users", id="INTEGER", username="TEXT", score="REAL")
+
+    def test_declared_table(self):
+        self.assertIsInstance(self.users, Table)
+        self.assertIs(self.schema["users"], self.users)
+        self.assertIs(self.schema.table("users"), self.users)
+        self.assertIn("users", self.schema)
+        self.assertEqual(self.users.columns, {"id": "INTEGER", "username": "TEXT", "score": "REAL"})
+
+    def test_undeclared_table(self):
+        with self.assertRaises(KeyError):
+            self.schema.table("orders")
+
+    def test_cached_columns(self):
+        self.assertIs(self.users.c.id, self.users.c.id)
+        self.assertIs(self.users.column("id"), self.users.c.id)
+        self.assertEqual(str(self.users.c.username), "users.username")
+        self.assertEqual(self.users.c.score.data_type, "REAL")
+        self.assertEqual([column.name for column in self.users.c], ["id", "username", "score"])
+
+    def test_unknown_column(self):
+        with self.assertRaises(AttributeError):
+            self.users.c.email
+        with self.assertRaises(ValueError):
+            self.users.column("email")
+
+    def test_alias_does_not_touch_shared_column(self):
+        aliased = self.users.c.id.as_alias("user_id")
+        self.assertEqual(str(aliased), "users.id AS user_id")
+        self.assertEqual(str(self.users.c.id), "users.id")
+
+    def test_param_adaptation(self):
+        query = SelectQuery(self.users).where(
+            self.users.c.id.eq("42"),
+            self.users.c.score.between("1.5", 3),
+            self.users.c.username.in_([7, "bob"]))
+        _, params = query.build()
+        self.assertEqual(params, [42, 1.5, 3.0, "7", "bob"])
+
+    def test_param_adaptation_error(self):
+        with self.assertRaises(ValueError):
+            self.users.c.id.eq("forty-two")
+
+    def test_reflect_sqlite(self):
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, total REAL, note)")
+        connection.execute("CREATE VIEW big_orders AS SELECT id FROM orders WHERE total > 100")
+        schema = Schema.from_sqlite(connection)
+        self.assertEqual(schema["orders"].columns, {"id": "INTEGER", "total": "REAL", "note": None})
+        self.assertEqual(list(schema["big_orders"].columns), ["id"])
+        self.assertEqual(schema["orders"].c.total.eq("9.5").params, [9.5])
+        connection.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
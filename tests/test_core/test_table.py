@@ -19,6 +19,15 @@ class TestTable(unittest.TestCase):
         self.assertIsInstance(column, Column)
         self.assertEqual(str(column), "users.username")
 
+    def test_declared_columns(self):
+        users = Table("users", columns={"id": "INTEGER", "username": "TEXT"})
+        self.assertIs(users.c.id, users.column("id"))
+        self.assertEqual(users.c.id.data_type, "INTEGER")
+        with self.assertRaises(ValueError):
+            users.column("email")
+        with self.assertRaises(AttributeError):
+            self.table.c
+
     def test_alias(self):
         orders = Table("orders", "myOrders")
         users = self.table.as_alias("myUsers")
@@ -0,0 +1,46 @@
+import io
+import socket
+import sqlite3
+import unittest
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.bulk import CopyQuery
+from src.sqlazybuilder.execution.bulk import FileWriter, SocketWriter, SqliteWriter
+
+
+class TestBulkWriters(unittest.TestCase):
+    def setUp(self):
+        self.users = Table("users", columns={"id": "integer", "name": "text"})
+        self.query = CopyQuery(self.users).buffer_size(16)
+        self.rows = [(i, f"user{i}") for i in range(10)]
+
+    def test_file_writer(self):
+        file = io.BytesIO()
+        self.assertEqual(FileWriter(file).write(self.query, iter(self.rows)), 10)
+        self.assertEqual(file.getvalue(), b"".join(self.query.encode(self.rows)))
+
+    def test_socket_writer(self):
+        sender, receiver = socket.socketpair()
+        try:
+            self.assertEqual(SocketWriter(sender).write(self.query, iter(self.rows)), 10)
+            sender.close()
+            received = b""
+            while chunk := receiver.recv(4096):
+                received += chunk
+        finally:
+            receiver.close()
+        self.assertTrue(received.startswith(b"0\tuser0\n1\tuser1\n"))
+
+    def test_sqlite_writer(self):
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE users (id INTEGER, name TEXT)")
+        rows = (row for row in [*self.rows, {"id": 10, "name": None}])
+        self.assertEqual(SqliteWriter(connection, batch_size=3).write(self.query, rows), 11)
+        self.assertEqual(connection.execute("SELECT COUNT(*), COUNT(name) FROM users").fetchone(), (11, 10))
+        with self.assertRaises(ValueError):
+            SqliteWriter(connection).write(self.query, [(11, "ann", "extra")])
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM users").fetchone(), (11,))
+        connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+import unittest
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.select import SelectQuery
+from src.sqlazybuilder.execution.coalesce import SingleFlight, AsyncSingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.users = Table("users")
+        self.query = SelectQuery(self.users).where(self.users.column("id").eq(1))
+
+    def test_concurrent_identical_queries_share_one_call(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def execute(sql, params):
+            calls.append((sql, params))
+            started.set()
+            release.wait(5)
+            return [("row",)]
+
+        flight = SingleFlight(execute)
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.execute(self.query)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(flight.execute(self.query)))
+                     for _ in range(5)]
+        for thread in followers:
+            thread.start()
+        while flight.stats.calls < 6:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [[("row",)]] * 6)
+        self.assertIsNot(results[0], results[1])
+        self.assertEqual(flight.stats.as_dict(), {"calls": 6, "executions": 1, "coalesced": 5})
+
+    def test_sequential_calls_are_not_cached(self):
+        calls = []
+        flight = SingleFlight(lambda sql, params: calls.append(params) or [])
+        flight.execute(self.query)
+        flight.execute(("SELECT * FROM users WHERE users.id = %s", [1]))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(flight.stats.coalesced, 0)
+
+    def test_errors_propagate(self):
+        def execute(sql, params):
+            raise RuntimeError("boom")
+
+        flight = SingleFlight(execute)
+        with self.assertRaises(RuntimeError):
+            flight.execute(self.query)
+        self.assertEqual(flight._flights, {})
+
+    def test_paramstyle(self):
+        seen = []
+        flight = SingleFlight(lambda sql, params: seen.append(sql), paramstyle="qmark")
+        flight.execute(self.query)
+        self.assertEqual(seen, ["SELECT * FROM users WHERE users.id = ?"])
+
+
+class TestAsyncSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.users = Table("users")
+
+    def test_concurrent_identical_queries_share_one_call(self):
+        calls = []
+
+        async def execute(sql, params):
+            calls.append(params)
+            await asyncio.sleep(0.01)
+            return [(params[0],)]
+
+        flight = AsyncSingleFlight(execute)
+
+        async def main():
+            queries = [SelectQuery(self.users).where(self.users.column("id").eq(key)) for key in (1, 1, 2, 1)]
+            return await asyncio.gather(*[flight.execute(query) for query in queries])
+
+        results = asyncio.run(main())
+        self.assertEqual(results, [[(1,)], [(1,)], [(2,)], [(1,)]])
+        self.assertEqual(calls, [[1], [2]])
+        self.assertEqual(flight.stats.as_dict(), {"calls": 4, "executions": 2, "coalesced": 2})
+        self.assertEqual(flight._flights, {})
+
+    def test_errors_propagate(self):
+        async def execute(sql, params):
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        flight = AsyncSingleFlight(execute)
+        query = SelectQuery(self.users)
+
+        async def main():
+            return await asyncio.gather(flight.execute(query), flight.execute(query), return_exceptions=True)
+
+        results = asyncio.run(main())
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(flight.stats.executions, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
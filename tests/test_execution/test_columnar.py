@@ -0,0 +1,76 @@
+import array
+import sqlite3
+import unittest
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.select import SelectQuery
+from src.sqlazybuilder.expressions.functions import Sum
+from src.sqlazybuilder.execution.columnar import fetch_columns, numpy
+
+
+class TestFetchColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute("CREATE TABLE sales (id INTEGER, region TEXT, amount REAL, discount REAL)")
+        self.connection.executemany(
+            "INSERT INTO sales VALUES (?, ?, ?, ?)",
+            [(i, "north" if i % 2 else "south", i * 1.5, None if i == 7 else 0.1) for i in range(10)])
+        self.sales = Table("sales", columns={"id": "INTEGER", "region": "TEXT", "amount": "REAL", "discount": "REAL"})
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_typed_columns(self):
+        query = SelectQuery(self.sales).select(self.sales.c.id, self.sales.c.amount, self.sales.c.region)
+        result = fetch_columns(self.connection.cursor(), query, batch_size=3, paramstyle="qmark", use_numpy=False)
+        self.assertEqual(list(result), ["id", "amount", "region"])
+        self.assertEqual(result["id"], array.array("q", range(10)))
+        self.assertEqual(result["amount"].typecode, "d")
+        self.assertEqual(result["region"][:2], ["south", "north"])
+
+    def test_nulls_fall_back_to_list(self):
+        query = SelectQuery(self.sales).select(self.sales.c.discount)
+        result = fetch_columns(self.connection.cursor(), query, batch_size=4, paramstyle="qmark", use_numpy=False)
+        self.assertIsInstance(result["discount"], list)
+        self.assertEqual(len(result["discount"]), 10)
+        self.assertIsNone(result["discount"][7])
+
+    def test_inferred_types_and_aliases(self):
+        region = Table("sales").column("region")
+        amount = Table("sales").column("amount")
+        query = (SelectQuery(self.sales)
+                 .select(region, Sum(amount).as_alias("total"))
+                 .group_by(region)
+                 .order_by(region))
+        result = fetch_columns(self.connection.cursor(), query, paramstyle="qmark", use_numpy=False)
+        self.assertEqual(result["region"], ["north", "south"])
+        self.assertEqual(result["total"], array.array("d", [37.5, 30.0]))
+
+    def test_select_star_and_empty_result(self):
+        query = SelectQuery(self.sales).where(self.sales.c.id.gt(100))
+        result = fetch_columns(self.connection.cursor(), query, paramstyle="qmark", use_numpy=False)
+        self.assertEqual(list(result), ["id", "region", "amount", "discount"])
+        self.assertEqual(len(result["id"]), 0)
+
+    def test_duplicate_names(self):
+        query = SelectQuery(self.sales).select(self.sales.c.id, Table("other").column("id"))
+        with self.assertRaises(ValueError):
+            fetch_columns(self.connection.cursor(), query, paramstyle="qmark", use_numpy=False)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_arrays(self):
+        query = SelectQuery(self.sales).select(self.sales.c.id, self.sales.c.discount)
+        result = fetch_columns(self.connection.cursor(), query, paramstyle="qmark", use_numpy=True)
+        self.assertEqual(result["id"].dtype, numpy.int64)
+        self.assertEqual(result["id"].sum(), 45)
+        self.assertEqual(result["discount"].dtype, object)
+
+    @unittest.skipIf(numpy is not None, "NumPy is installed")
+    def test_numpy_required(self):
+        query = SelectQuery(self.sales).select(self.sales.c.id)
+        with self.assertRaises(ImportError):
+            fetch_columns(self.connection.cursor(), query, paramstyle="qmark", use_numpy=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
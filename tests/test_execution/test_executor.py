@@ -0,0 +1,49 @@
+import sqlite3
+import unittest
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.select import SelectQuery
+from src.sqlazybuilder.expressions.functions import CountAll
+from src.sqlazybuilder.execution.executor import convert_placeholders, execute, column_names
+
+
+class TestExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute("CREATE TABLE users (id INTEGER, username TEXT)")
+        self.connection.executemany("INSERT INTO users VALUES (?, ?)", [(1, "John"), (2, "Jane")])
+        self.users = Table("users")
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_convert_placeholders(self):
+        sql = "SELECT * FROM users WHERE users.id = %s AND users.age > %s"
+        self.assertEqual(convert_placeholders(sql), sql)
+        self.assertEqual(convert_placeholders(sql, "qmark"),
+                         "SELECT * FROM users WHERE users.id = ? AND users.age > ?")
+        self.assertEqual(convert_placeholders(sql, "numeric"),
+                         "SELECT * FROM users WHERE users.id = :1 AND users.age > :2")
+        with self.assertRaises(ValueError):
+            convert_placeholders(sql, "pyformat")
+
+    def test_execute(self):
+        query = SelectQuery(self.users).select(self.users.column("username")).where(
+            self.users.column("id").eq(2))
+        cursor = execute(self.connection.cursor(), query, "qmark")
+        self.assertEqual(cursor.fetchall(), [("Jane",)])
+
+    def test_column_names(self):
+        query = SelectQuery(self.users).select(
+            self.users.column("id"), self.users.column("username").as_alias("name"), CountAll())
+        self.assertEqual(column_names(query), ["id", "name", "COUNT(*)"])
+
+        query = SelectQuery(self.users)
+        with self.assertRaises(ValueError):
+            column_names(query)
+        cursor = execute(self.connection.cursor(), query, "qmark")
+        self.assertEqual(column_names(query, cursor), ["id", "username"])
+
+
+if __name__ == '__main__':
+    unittest.main()
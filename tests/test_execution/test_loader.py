@@ -0,0 +1,124 @@
+import asyncio
+import sqlite3
+import unittest
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.select import SelectQuery
+from src.sqlazybuilder.execution.executor import convert_placeholders
+from src.sqlazybuilder.execution.loader import BatchLoader
+
+
+class TestBatchLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute("CREATE TABLE users (id INTEGER, username TEXT, active INTEGER)")
+        self.connection.executemany("INSERT INTO users VALUES (?, ?, ?)",
+                                    [(i, f"user{i}", i % 2) for i in range(1, 11)])
+        self.users = Table("users", columns={"id": "INTEGER", "username": "TEXT", "active": "INTEGER"})
+        self.calls = []
+
+    def tearDown(self):
+        self.connection.close()
+
+    async def execute(self, sql, params):
+        self.calls.append((sql, list(params)))
+        await asyncio.sleep(0)
+        return self.connection.execute(convert_placeholders(sql, "qmark"), params).fetchall()
+
+    def lookup(self, key, *columns):
+        return SelectQuery(self.users).select(*columns).where(self.users.column("id").eq(key))
+
+    def run_loads(self, loader, queries):
+        async def main():
+            return await asyncio.gather(*[loader.load(query) for query in queries])
+        return asyncio.run(main())
+
+    def test_point_lookups_are_merged(self):
+        loader = BatchLoader(self.execute)
+        username = self.users.column("username")
+        results = self.run_loads(loader, [self.lookup(key, username) for key in (3, 1, 3, 42)])
+        self.assertEqual(results, [[("user3",)], [("user1",)], [("user3",)], []])
+        self.assertEqual(self.calls, [
+            ("SELECT users.username, users.id FROM users WHERE users.id IN (%s, %s, %s)", [3, 1, 42])])
+        self.assertEqual((loader.requested, loader.executed), (4, 1))
+
+    def test_select_star_lookups(self):
+        loader = BatchLoader(self.execute)
+        results = self.run_loads(loader, [self.lookup(2), self.lookup(5)])
+        self.assertEqual(results, [[(2, "user2", 0)], [(5, "user5", 1)]])
+        self.assertEqual(self.calls[0][0], "SELECT users.*, users.id FROM users WHERE users.id IN (%s, %s)")
+
+    def test_different_shapes_are_batched_separately(self):
+        loader = BatchLoader(self.execute)
+        active = self.users.column("active")
+        queries = [
+            SelectQuery(self.users).where(active.eq(1), self.users.column("id").eq(1)),
+            SelectQuery(self.users).where(active.eq(1), self.users.column("id").eq(3)),
+            SelectQuery(self.users).where(active.eq(0), self.users.column("id").eq(1)),
+        ]
+        results = self.run_loads(loader, queries)
+        self.assertEqual(results, [[(1, "user1", 1)], [(3, "user3", 1)], []])
+        self.assertEqual(len(self.calls), 2)
+
+    def test_batch_size_cap(self):
+        loader = BatchLoader(self.execute, max_batch_size=3)
+        results = self.run_loads(loader, [self.lookup(key) for key in range(1, 9)])
+        self.assertEqual([rows[0][0] for rows in results], list(range(1, 9)))
+        self.assertEqual([len(params) for _, params in self.calls], [3, 3, 2])
+
+    def test_unbatchable_queries_run_directly(self):
+        loader = BatchLoader(self.execute)
+        queries = [self.lookup(1).limit(1), SelectQuery(self.users).where(self.users.column("id").gt(8))]
+        results = self.run_loads(loader, queries)
+        self.assertEqual(results, [[(1, "user1", 1)], [(9, "user9", 1), (10, "user10", 0)]])
+        self.assertEqual(len(self.calls), 2)
+
+    def test_errors_reach_every_caller(self):
+        async def failing(sql, params):
+            raise RuntimeError("database is down")
+
+        loader = BatchLoader(failing)
+
+        async def main():
+            return await asyncio.gather(loader.load(self.lookup(1)), loader.load(self.lookup(2)),
+                                        return_exceptions=True)
+        results = asyncio.run(main())
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    def test_delay_window(self):
+        loader = BatchLoader(self.execute, delay=0.01)
+
+        async def main():
+            first = asyncio.ensure_future(loader.load(self.lookup(1)))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(loader.load(self.lookup(2)))
+            return await asyncio.gather(first, second)
+        results = asyncio.run(main())
+        self.assertEqual([rows[0][0] for rows in results], [1, 2])
+        self.assertEqual(len(self.calls), 1)
+
+    def test_keys_the_database_matches_differently(self):
+        self.connection.execute("CREATE TABLE accounts (id INTEGER, email TEXT COLLATE NOCASE)")
+        self.connection.executemany("INSERT INTO accounts VALUES (?, ?)",
+                                    [(1, "ann@example.com"), (2, "Bob@example.com"), (3, "bob@example.com")])
+        accounts = Table("accounts")
+        loader = BatchLoader(self.execute)
+
+        def lookup(column, key):
+            return SelectQuery(accounts).select(accounts.column("id")).where(accounts.column(column).eq(key))
+
+        results = self.run_loads(loader, [lookup("email", "ANN@example.com"), lookup("email", "ann@example.com"),
+                                          lookup("email", "BOB@EXAMPLE.COM"), lookup("email", "nobody")])
+        self.assertEqual(results, [[(1,)], [(1,)], [(2,), (3,)], []])
+        results = self.run_loads(loader, [lookup("id", "3"), lookup("id", 1)])
+        self.assertEqual(results, [[(3,)], [(1,)]])
+
+    def test_original_query_is_untouched(self):
+        loader = BatchLoader(self.execute)
+        query = self.lookup(4, self.users.column("username"))
+        self.run_loads(loader, [query])
+        self.assertEqual(query.build(), ("SELECT users.username FROM users WHERE users.id = %s", [4]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+import sqlite3
+import unittest
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.select import SelectQuery
+from src.sqlazybuilder.expressions.functions import (Avg, Cast, Coalesce, Count, CountAll, CountDistinct, Max,
+                                                     Min, Substring, Sum)
+from src.sqlazybuilder.expressions.conditions import exists
+from src.sqlazybuilder.expressions.functions import Function
+from src.sqlazybuilder.execution.executor import execute
+from src.sqlazybuilder.execution.memory import MemoryEngine
+
+USERS = [
+    {"id": 1, "username": "alice", "age": 30, "city": "Paris"},
+    {"id": 2, "username": "bob", "age": 25, "city": None},
+    {"id": 3, "username": "carol", "age": None, "city": "Oslo"},
+    {"id": 4, "username": "dave", "age": 41, "city": "Paris"},
+]
+
+ORDERS = {
+    "order_id": [10, 11, 12, 13, 14],
+    "user_id": [1, 1, 2, 4, 9],
+    "total": [120.0, 80.5, 15.0, None, 60.0],
+}
+
+
+class TestMemoryEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.users = Table("users")
+        self.orders = Table("orders")
+        self.engine = MemoryEngine({"users": USERS, "orders": ORDERS})
+
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute("CREATE TABLE users (id INTEGER, username TEXT, age INTEGER, city TEXT)")
+        self.connection.execute("CREATE TABLE orders (order_id INTEGER, user_id INTEGER, total REAL)")
+        self.connection.executemany("INSERT INTO users VALUES (:id, :username, :age, :city)", USERS)
+        self.connection.executemany("INSERT INTO orders VALUES (?, ?, ?)", list(zip(*ORDERS.values())))
+
+    def tearDown(self):
+        self.connection.close()
+
+    def assertMatchesSqlite(self, query, ordered=True):
+        expected = execute(self.connection.cursor(), query, "qmark").fetchall()
+        actual = self.engine.execute(query)
+        if ordered:
+            self.assertEqual(actual, expected)
+        else:
+            self.assertCountEqual(actual, expected)
+        return actual
+
+    def test_select_star(self):
+        rows = self.assertMatchesSqlite(SelectQuery(self.users))
+        self.assertEqual(len(rows), 4)
+
+    def test_conditions(self):
+        age = self.users.column("age")
+        city = self.users.column("city")
+        username = self.users.column("username")
+        queries = [
+            SelectQuery(self.users).select(username).where(age.gt(26)),
+            SelectQuery(self.users).select(username).where(age.between(20, 35) | city.eq("Oslo")),
+            SelectQuery(self.users).select(username).where(~city.eq("Paris")),
+            SelectQuery(self.users).select(username).where(city.is_null()),
+            SelectQuery(self.users).select(username).where(age.is_not_null(), city.ne("Oslo")),
+            SelectQuery(self.users).select(username).where(username.like("%a%"), username.not_like("d%")),
+            SelectQuery(self.users).select(username).where(self.users.column("id").in_([1, 3, 7])),
+            SelectQuery(self.users).select(username).where(self.users.column("id").not_in([1, None])),
+            SelectQuery(self.users).select(username).where(~(age.lt(30) & city.eq("Paris"))),
+            SelectQuery(self.users).select(username).where(city.like("p%"), username.not_like("A%")),
+            SelectQuery(self.users).select(username).where(self.users.column("id").like("1%")),
+            SelectQuery(self.users).select(username).where(self.users.column("id").gt("1")),
+            SelectQuery(self.users).select(username).where(self.users.column("id").eq("3")),
+            SelectQuery(self.users).select(username).where(self.users.column("id").ne("x")),
+            SelectQuery(self.users).select(username).where(age.between("26", 41)),
+            SelectQuery(self.users).select(username).where(username.gt(5), city.lt(0)),
+        ]
+        for query in queries:
+            with self.subTest(sql=query.build()[0]):
+                self.assertMatchesSqlite(query, ordered=False)
+
+    def test_case_sensitive_like(self):
+        engine = MemoryEngine({"users": USERS}, case_sensitive_like=True)
+        city = self.users.column("city")
+        self.assertEqual(engine.execute(SelectQuery(self.users).select(city).where(city.like("p%"))), [])
+        self.assertEqual(len(engine.execute(SelectQuery(self.users).select(city).where(city.like("P%")))), 2)
+
+    def test_incomparable_values(self):
+        engine = MemoryEngine({"events": [{"id": 1, "payload": {"a": 1}}]})
+        events = Table("events")
+        with self.assertRaisesRegex(ValueError, "Cannot compare"):
+            engine.execute(SelectQuery(events).where(events.column("payload").gt(1)))
+
+    def test_scalar_functions(self):
+        query = SelectQuery(self.users).select(
+            Coalesce(self.users.column("city"), self.users.column("username")),
+            Substring(self.users.column("username"), 2, 3),
+            Cast(self.users.column("age"), "TEXT"))
+        self.assertEqual(self.engine.execute(query)[1], ("bob", "ob", "25"))
+        self.assertEqual(self.engine.execute(query)[2], ("Oslo", "aro", None))
+
+    def test_in_subquery(self):
+        subq = SelectQuery(self.orders).select(self.orders.column("user_id")).where(
+            self.orders.column("total").gt(50))
+        query = SelectQuery(self.users).select(self.users.column("username")).where(
+            self.users.column("id").in_(subq))
+        self.assertMatchesSqlite(query, ordered=False)
+
+    def test_inner_and_left_joins(self):
+        join_condition = self.users.column("id").eq(self.orders.column("user_id"))
+        columns = (self.users.column("username"), self.orders.column("order_id"))
+        inner = SelectQuery(self.users).select(*columns).inner_join(self.orders, join_condition)
+        left = SelectQuery(self.users).select(*columns).left_join(self.orders, join_condition)
+        self.assertEqual(len(self.assertMatchesSqlite(inner, ordered=False)), 4)
+        self.assertEqual(len(self.assertMatchesSqlite(left, ordered=False)), 5)
+
+    def test_join_with_residual_condition(self):
+        condition = self.users.column("id").eq(self.orders.column("user_id")) & \
+            self.orders.column("total").gt(50)
+        query = (SelectQuery(self.users)
+                 .select(self.users.column("username"), self.orders.column("total"))
+                 .left_join(self.orders, condition))
+        self.assertMatchesSqlite(query, ordered=False)
+
+    def test_right_and_full_joins(self):
+        condition = self.users.column("id").eq(self.orders.column("user_id"))
+        columns = (self.users.column("username"), self.orders.column("order_id"))
+        right = self.engine.execute(SelectQuery(self.users).select(*columns).right_join(self.orders, condition))
+        full = self.engine.execute(SelectQuery(self.users).select(*columns).full_join(self.orders, condition))
+        self.assertIn((None, 14), right)
+        self.assertEqual(len(right), 5)
+        self.assertIn(("carol", None), full)
+        self.assertEqual(len(full), 6)
+
+    def test_join_subquery_with_alias(self):
+        subq = (SelectQuery(self.orders)
+                .select(self.orders.column("user_id"), Sum(self.orders.column("total")).as_alias("spent"))
+                .group_by(self.orders.column("user_id"))
+                .as_alias("spend"))
+        query = (SelectQuery(self.users)
+                 .select(self.users.column("username"), subq.column("spent"))
+                 .inner_join(subq, self.users.column("id").eq(subq.column("user_id")))
+                 .order_by(self.users.column("username")))
+        self.assertMatchesSqlite(query)
+
+    def test_group_by_aggregates(self):
+        city = self.users.column("city")
+        age = self.users.column("age")
+        query = (SelectQuery(self.users)
+                 .select(city, CountAll(), Count(age), Sum(age), Avg(age), Min(age), Max(age),
+                         CountDistinct(self.users.column("username")))
+                 .group_by(city)
+                 .order_by(city))
+        self.assertMatchesSqlite(query)
+
+    def test_aggregates_without_group_by(self):
+        total = self.orders.column("total")
+        self.assertMatchesSqlite(SelectQuery(self.orders).select(CountAll(), Sum(total), Max(total)))
+        self.assertMatchesSqlite(
+            SelectQuery(self.orders).select(CountAll(), Sum(total)).where(total.gt(1000)))
+
+    def test_having(self):
+        user_id = self.orders.column("user_id")
+        query = (SelectQuery(self.orders)
+                 .select(user_id, CountAll().as_alias("n"))
+                 .group_by(user_id)
+                 .having(CountAll().gt(1)))
+        self.assertEqual(self.assertMatchesSqlite(query), [(1, 2)])
+
+    def test_order_limit_offset(self):
+        age = self.users.column("age")
+        query = (SelectQuery(self.users)
+                 .select(self.users.column("username"), age)
+                 .order_by(age, "DESC")
+                 .order_by(self.users.column("username"))
+                 .limit(2)
+                 .offset(1))
+        self.assertMatchesSqlite(query)
+        self.assertMatchesSqlite(SelectQuery(self.users).order_by(age))
+
+    def test_from_subquery_and_dicts(self):
+        subq = (SelectQuery(self.users)
+                .select(self.users.column("username").as_alias("name"), self.users.column("age"))
+                .where(self.users.column("age").gte(30))
+                .as_alias("seniors"))
+        query = SelectQuery(subq).select(subq.column("name")).order_by(subq.column("name"))
+        self.assertMatchesSqlite(query)
+        self.assertEqual(self.engine.execute_dicts(query), [{"name": "alice"}, {"name": "dave"}])
+
+    def test_declared_table_registration(self):
+        products = Table("products", columns={"sku": "TEXT", "price": "REAL"})
+        engine = MemoryEngine()
+        engine.register(products, [{"sku": "a1", "price": 2.5}, {"sku": "b2"}])
+        rows = engine.execute(SelectQuery(products).where(products.c.price.is_null()))
+        self.assertEqual(rows, [("b2", None)])
+
+    def test_unknown_table_and_column(self):
+        with self.assertRaises(ValueError):
+            self.engine.execute(SelectQuery(Table("missing")))
+        with self.assertRaises(ValueError):
+            self.engine.execute(SelectQuery(self.users).select(self.users.column("missing")))
+
+    def test_unsupported_expressions(self):
+        subquery = SelectQuery(self.orders).where(self.orders.column("user_id").eq(self.users.column("id")))
+        queries = [
+            SelectQuery(self.users).where(exists(subquery)),
+            SelectQuery(self.users).select(Function("REVERSE", self.users.column("username"))),
+        ]
+        for query in queries:
+            with self.subTest(sql=query.build()[0]):
+                with self.assertRaisesRegex(ValueError, "in memory"):
+                    self.engine.execute(query)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import contextlib
+import sqlite3
+import unittest
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.select import SelectQuery
+from src.sqlazybuilder.execution.pipeline import Pipeline
+
+
+class FakeMultiCursor:
+    def __init__(self, result_sets, fail_at=None):
+        self.result_sets = result_sets
+        self.fail_at = fail_at
+        self.calls = []
+        self.position = 0
+        self.description = [("value",)]
+
+    def execute(self, sql, params):
+        self.calls.append((sql, params))
+        if self.fail_at == 0:
+            raise RuntimeError("statement 0 failed")
+
+    def fetchall(self):
+        return self.result_sets[self.position]
+
+    def nextset(self):
+        self.position += 1
+        if self.position == self.fail_at:
+            raise RuntimeError(f"statement {self.position} failed")
+        return self.position < len(self.result_sets)
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.pipelines = 0
+
+    def cursor(self):
+        return self._cursor
+
+    @contextlib.contextmanager
+    def pipeline(self):
+        self.pipelines += 1
+        yield
+
+
+class FakeProgrammingError(Exception):
+    pass
+
+
+class FakeUndefinedColumn(FakeProgrammingError):
+    pass
+
+
+class FakeStatementCursor:
+    # Like psycopg's pipeline mode, the description stays unset until the
+    # result has been fetched.
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+
+    def execute(self, sql, params):
+        self.index = len(self.connection.queued)
+        if self.index == self.connection.fail_at:
+            raise RuntimeError(f"statement {self.index} failed")
+        self.connection.queued.append((sql, params))
+        self.sql = sql
+
+    def fetchall(self):
+        if "missing" in self.sql:
+            raise FakeUndefinedColumn("column missing does not exist")
+        if not self.sql.startswith("SELECT"):
+            raise FakeProgrammingError("the last operation didn't produce a result")
+        self.description = [("value",)]
+        return [(self.index,)]
+
+
+class FakePipelineConnection(FakeConnection):
+    ProgrammingError = FakeProgrammingError
+
+    def __init__(self, fail_at=None):
+        super().__init__(None)
+        self.fail_at = fail_at
+        self.queued = []
+
+    def cursor(self):
+        return FakeStatementCursor(self)
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.users = Table("users")
+        self.id_col = self.users.column("id")
+        self.username_col = self.users.column("username")
+
+    def queries(self):
+        return [
+            SelectQuery(self.users).select(self.username_col).where(self.id_col.eq(1)),
+            ("SELECT COUNT(*) FROM users WHERE id > %s", [1]),
+            SelectQuery(self.users).select(self.id_col).where(self.username_col.eq("b")),
+        ]
+
+    def test_sequential_with_sqlite(self):
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE users (id INTEGER, username TEXT)")
+        connection.executemany("INSERT INTO users VALUES (?, ?)", [(1, "a"), (2, "b"), (3, "c")])
+        pipeline = Pipeline(connection, "qmark")
+        for query in self.queries():
+            pipeline.add(query)
+        pipeline.add(("SELECT missing FROM users", []))
+        results = pipeline.execute()
+        self.assertEqual([result.rows for result in results[:3]], [[("a",)], [(2,)], [(2,)]])
+        self.assertIsInstance(results[3].error, sqlite3.OperationalError)
+        self.assertEqual(len(pipeline), 0)
+        connection.close()
+
+    def test_multi_statement_request(self):
+        cursor = FakeMultiCursor([[("a",)], [(2,)], [(2,)]])
+        pipeline = Pipeline(FakeConnection(cursor), "numeric", mode="multi")
+        for query in self.queries():
+            pipeline.add(query)
+        results = pipeline.execute()
+        self.assertEqual(cursor.calls, [(
+            "SELECT users.username FROM users WHERE users.id = :1; SELECT COUNT(*) FROM users WHERE id > :2; "
+            "SELECT users.id FROM users WHERE users.username = :3", [1, 1, "b"])])
+        self.assertEqual([result.rows for result in results], [[("a",)], [(2,)], [(2,)]])
+        self.assertTrue(all(result.ok for result in results))
+
+    def test_multi_statement_error_attribution(self):
+        cursor = FakeMultiCursor([[("a",)], [(2,)], [(2,)]], fail_at=1)
+        pipeline = Pipeline(FakeConnection(cursor), mode="multi")
+        for query in self.queries():
+            pipeline.add(query)
+        first, second, third = pipeline.execute()
+        self.assertEqual(first.rows, [("a",)])
+        self.assertEqual(str(second.error), "statement 1 failed")
+        self.assertTrue(third.aborted)
+        self.assertIsNone(third.error)
+
+    def test_driver_pipeline_mode(self):
+        connection = FakePipelineConnection()
+        pipeline = Pipeline(connection, mode="pipeline")
+        for query in self.queries():
+            pipeline.add(query)
+        pipeline.add(("UPDATE users SET username = %s", ["x"]))
+        results = pipeline.execute()
+        self.assertEqual(connection.pipelines, 1)
+        self.assertEqual(len(connection.queued), 4)
+        self.assertEqual([result.rows for result in results], [[(0,)], [(1,)], [(2,)], []])
+
+        connection = FakePipelineConnection()
+        first, second, third = Pipeline(connection, mode="pipeline").add(self.queries()[0]).add(
+            ("SELECT missing FROM users", [])).add(self.queries()[1]).execute()
+        self.assertTrue(first.ok)
+        self.assertIsInstance(second.error, FakeUndefinedColumn)
+        self.assertTrue(third.aborted)
+
+        connection = FakePipelineConnection(fail_at=1)
+        pipeline = Pipeline(connection, mode="pipeline")
+        for query in self.queries():
+            pipeline.add(query)
+        first, second, third = pipeline.execute()
+        self.assertEqual(len(connection.queued), 1)
+        self.assertTrue(first.ok)
+        self.assertEqual(first.rows, [(0,)])
+        self.assertEqual(str(second.error), "statement 1 failed")
+        self.assertTrue(third.aborted)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            Pipeline(None, mode="parallel")
+        with self.assertRaises(ValueError):
+            Pipeline(None, paramstyle="pyformat")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import datetime
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.select import SelectQuery
+from src.sqlazybuilder.execution.recorder import QueryRecorder, fingerprint, percentile, read_log, replay
+
+
+class TestQueryRecorder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.directory.name, "test.db")
+        connection = sqlite3.connect(self.database)
+        connection.execute("CREATE TABLE users (id INTEGER, username TEXT)")
+        connection.executemany("INSERT INTO users VALUES (?, ?)", [(i, f"user{i}") for i in range(1, 21)])
+        connection.commit()
+        connection.close()
+        self.users = Table("users")
+        self.id_col = self.users.column("id")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_fingerprint_ignores_in_list_length(self):
+        one = SelectQuery(self.users).where(self.id_col.in_([1])).build()[0]
+        three = SelectQuery(self.users).where(self.id_col.in_([1, 2, 3])).build()[0]
+        other = SelectQuery(self.users).where(self.id_col.eq(1)).build()[0]
+        self.assertEqual(fingerprint(one), fingerprint(three))
+        self.assertNotEqual(fingerprint(one), fingerprint(other))
+
+    def test_log_round_trip(self):
+        log = io.BytesIO()
+        recorder = QueryRecorder(log)
+        recorder.record("SELECT %s", [datetime.date(2024, 1, 2)], 0.5, timestamp=10.0)
+        recorder.record("SELECT %s", [None], 0.25, timestamp=11.0)
+        log.seek(0)
+        self.assertEqual(list(read_log(log)), [
+            (fingerprint("SELECT %s"), "SELECT %s", [datetime.date(2024, 1, 2)], 10.0, 0.5),
+            (fingerprint("SELECT %s"), "SELECT %s", [None], 11.0, 0.25),
+        ])
+        # The SQL text is written once, however many times it's executed.
+        self.assertEqual(log.getvalue().count(b"SELECT %s"), 1)
+
+    def test_unencodable_params_are_skipped(self):
+        class Cursor:
+            def execute(self, sql, params):
+                self.executed = (sql, params)
+
+        class Point:
+            pass
+
+        log = io.BytesIO()
+        recorder = QueryRecorder(log)
+        cursor = Cursor()
+        point = Point()
+        recorder.execute(cursor, ("SELECT %s", [point]))
+        self.assertEqual(cursor.executed, ("SELECT %s", [point]))
+        self.assertEqual((recorder.recorded, recorder.skipped), (0, 1))
+        self.assertEqual(log.getvalue(), b"")
+
+    def test_truncated_log_stops_cleanly(self):
+        log = io.BytesIO()
+        QueryRecorder(log).record("SELECT 1", [], 0.1)
+        QueryRecorder(log).record("SELECT 2", [], 0.1)
+        data = log.getvalue()
+        self.assertEqual([record[1] for record in read_log(io.BytesIO(data[:-3]))], ["SELECT 1"])
+
+    def test_record_and_replay(self):
+        log = io.BytesIO()
+        recorder = QueryRecorder(log)
+        connection = sqlite3.connect(self.database)
+        cursor = connection.cursor()
+        for key in range(1, 11):
+            recorder.execute(cursor, SelectQuery(self.users).where(self.id_col.eq(key)), "qmark")
+            self.assertEqual(cursor.fetchall(), [(key, f"user{key}")])
+        recorder.execute(cursor, SelectQuery(self.users).where(self.id_col.in_([1, 2])), "qmark")
+        connection.close()
+        self.assertEqual(recorder.recorded, 11)
+
+        log.seek(0)
+        records = list(read_log(log))
+        records.append((fingerprint("SELECT missing"), "SELECT missing", [], 0.0, 0.0))
+        report = replay(records, lambda: sqlite3.connect(self.database), concurrency=3)
+        self.assertEqual((report["queries"], report["errors"]), (11, 1))
+        point = report["fingerprints"][records[0][0]]
+        self.assertEqual(point["count"], 10)
+        self.assertLessEqual(point["p50"], point["p95"])
+        self.assertLessEqual(point["p95"], point["p99"])
+        self.assertEqual(report["fingerprints"][fingerprint("SELECT missing")]["errors"], 1)
+
+    def test_replay_rate_limit(self):
+        records = [("f", "SELECT 1", [], 0.0, 0.0)] * 5
+        report = replay(records, lambda: sqlite3.connect(":memory:"), rate=100)
+        self.assertGreaterEqual(report["duration"], 0.04)
+
+    def test_percentile(self):
+        self.assertEqual(percentile(range(1, 101), 0.95), 95)
+        self.assertEqual(percentile([3], 0.99), 3)
+        self.assertIsNone(percentile([], 0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
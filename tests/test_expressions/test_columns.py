@@ -1,4 +1,5 @@
 import unittest
+from decimal import Decimal
 from src.sqlazybuilder.expressions.columns import Column
 
 
@@ -84,6 +85,26 @@ class TestColumn(unittest.TestCase):
         self.assertEqual(str(condition), "users.username IS NOT NULL")
         self.assertEqual(condition.params, [])
 
+    def test_adapt(self):
+        typed = Column("users", "age", data_type="INTEGER")
+        self.assertEqual(typed.adapt("21"), 21)
+        self.assertEqual(typed.gt("21").params, [21])
+        self.assertEqual(typed.eq(None).params, [None])
+        self.assertEqual(self.age_col.adapt("21"), "21")
+        self.assertEqual(typed.adapt(Decimal("2.00")), 2)
+        for value in (2.5, Decimal("1.5"), Decimal("Infinity"), Decimal("NaN")):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    typed.adapt(value)
+
+    def test_adapt_leaves_unknown_types_alone(self):
+        for data_type in ("INTERVAL", "POINT", "TIMESTAMP WITH TIME ZONE", "JSONB", "INET", "UUID"):
+            column = Column("users", "value", data_type=data_type)
+            self.assertEqual(column.eq("1 day").params, ["1 day"])
+        self.assertEqual(Column("users", "id", data_type="bigint unsigned").adapt("7"), 7)
+        self.assertEqual(Column("users", "name", data_type="VARCHAR(20)").adapt(7), "7")
+        self.assertEqual(Column("users", "score", data_type="double precision").adapt("1.5"), 1.5)
+
     def test_alias(self):
         user = self.username_col.as_alias("user")
         email = Column("users", "email_address", "email")
@@ -1,6 +1,8 @@
 import unittest
 from src.sqlazybuilder.expressions.columns import Column
-from src.sqlazybuilder.expressions.conditions import Condition, AndCondition, OrCondition, NotCondition
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.select import SelectQuery
+from src.sqlazybuilder.expressions.conditions import Condition, AndCondition, OrCondition, NotCondition, exists, not_exists
 
 
 class TestCondition(unittest.TestCase):
@@ -75,5 +77,25 @@ class TestCondition(unittest.TestCase):
             Condition(self.username_col, "NOT IN", "John")
 
 
+    def test_exists(self):
+        orders = Table("orders")
+        subquery = SelectQuery(orders).where(
+            orders.column("user_id").eq(Column("users", "id")), orders.column("total").gt(100))
+        condition = exists(subquery)
+        self.assertEqual(str(condition),
+                         "EXISTS (SELECT * FROM orders WHERE orders.user_id = users.id AND orders.total > %s)")
+        self.assertEqual(condition.params, [100])
+        self.assertEqual(str(not_exists(subquery)), "NOT " + str(condition))
+        self.assertEqual(str(~condition), str(not_exists(subquery)))
+
+        combined = self.age_col.gt(25) & exists(subquery)
+        self.assertEqual(str(combined), f"(users.age > %s AND {condition})")
+        self.assertEqual(combined.params, [25, 100])
+
+    def test_exists_requires_subquery(self):
+        with self.assertRaises(ValueError):
+            exists(self.username_col)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,80 @@
+import datetime
+import struct
+import unittest
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.bulk import CopyQuery, BINARY_SIGNATURE, FORMATS
+
+
+class TestCopyQuery(unittest.TestCase):
+    def setUp(self):
+        self.users = Table("users", columns={"id": "integer", "name": "text", "joined": "date"})
+
+    def test_build(self):
+        self.assertEqual(CopyQuery(self.users).build(), ("COPY users (id, name, joined) FROM STDIN", []))
+        self.assertEqual(CopyQuery(self.users).columns("id", "name").format("csv").build(),
+                         ("COPY users (id, name) FROM STDIN WITH (FORMAT csv)", []))
+
+    def test_build_requires_columns(self):
+        with self.assertRaises(ValueError):
+            CopyQuery(Table("users")).build()
+        with self.assertRaises(ValueError):
+            CopyQuery(self.users).format("xml")
+
+    def test_text_format_escapes_values(self):
+        query = CopyQuery(self.users).columns("id", "name")
+        data = b"".join(query.encode([(1, "a\tb\\c\nd"), (2, None), {"name": "dict", "id": 3}]))
+        self.assertEqual(data, b"1\ta\\tb\\\\c\\nd\n2\t\\N\n3\tdict\n")
+
+    def test_csv_format_quotes_values(self):
+        query = CopyQuery(self.users).columns("id", "name").format("csv")
+        data = b"".join(query.encode([(1, 'say "hi", ok'), (2, ""), (3, None), (4, "\\.")]))
+        self.assertEqual(data, b'1,"say ""hi"", ok"\n2,""\n3,\n4,"\\."\n')
+
+    def test_rows_must_match_columns(self):
+        for copy_format in FORMATS:
+            query = CopyQuery(self.users).columns("id", "name").format(copy_format)
+            for row in [(2,), (2, "bob", "extra"), {"id": 2}, {"id": 2, "nmae": "bob"},
+                        {"id": 2, "name": "bob", "joined": None}]:
+                with self.subTest(format=copy_format, row=row):
+                    with self.assertRaisesRegex(ValueError, "Row 2 "):
+                        list(query.encode([(1, "ann"), row]))
+
+    def test_mapping_row_errors_name_the_keys(self):
+        query = CopyQuery(self.users).columns("id", "name")
+        with self.assertRaisesRegex(ValueError, "Row 1 doesn't match the COPY columns; missing name; unknown nmae."):
+            list(query.encode([{"id": 1, "nmae": "ann"}]))
+
+    def test_binary_format(self):
+        query = CopyQuery(self.users).format("binary")
+        data = b"".join(query.encode([(1, "ann", datetime.date(2000, 1, 2)), (2, None, None)]))
+        self.assertTrue(data.startswith(BINARY_SIGNATURE + struct.pack("!ii", 0, 0)))
+        body = data[len(BINARY_SIGNATURE) + 8:]
+        first = struct.pack("!h", 3) + struct.pack("!ii", 4, 1) + struct.pack("!i", 3) + b"ann" + \
+            struct.pack("!ii", 4, 1)
+        second = struct.pack("!h", 3) + struct.pack("!ii", 4, 2) + struct.pack("!ii", -1, -1)
+        self.assertEqual(body, first + second + struct.pack("!h", -1))
+
+    def test_binary_format_requires_known_types(self):
+        query = CopyQuery(Table("users")).columns("id").format("binary")
+        with self.assertRaises(ValueError):
+            list(query.encode([(1,)]))
+
+    def test_encoding_is_streamed_in_chunks(self):
+        pulled = []
+
+        def rows():
+            for i in range(1000):
+                pulled.append(i)
+                yield (i, "x" * 10)
+
+        chunks = CopyQuery(self.users).columns("id", "name").buffer_size(256).encode(rows())
+        first = next(chunks)
+        self.assertGreaterEqual(len(first), 256)
+        self.assertLess(len(pulled), 50)
+        rest = list(chunks)
+        self.assertTrue(all(len(chunk) < 512 for chunk in [first, *rest]))
+        self.assertEqual(len(pulled), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import warnings
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.select import SelectQuery
+from src.sqlazybuilder.queries.lint import QueryLinter, QueryGuardrailError, QueryGuardrailWarning
+from src.sqlazybuilder.expressions.conditions import exists
+from src.sqlazybuilder.expressions.functions import Function, Count
+
+
+class TestQueryLinter(unittest.TestCase):
+    def setUp(self):
+        self.users = Table("users")
+        self.id_col = self.users.column("id")
+        self.email_col = self.users.column("email")
+        self.orders = Table("orders")
+        self.user_id_col = self.orders.column("user_id")
+
+    def rules(self, query, **options):
+        return [violation.rule for violation in QueryLinter(**options).check(query)]
+
+    def test_clean_query(self):
+        query = SelectQuery(self.users).inner_join(self.orders, self.user_id_col.eq(self.id_col)) \
+            .where(self.email_col.like("a%")).limit(10)
+        self.assertEqual(self.rules(query), [])
+
+    def test_cartesian_join(self):
+        query = SelectQuery(self.users).inner_join(self.orders, self.id_col.eq(1)).limit(10)
+        self.assertEqual(self.rules(query), ["cartesian_join"])
+
+    def test_missing_limit(self):
+        self.assertEqual(self.rules(SelectQuery(self.users)), ["missing_limit"])
+        self.assertEqual(self.rules(SelectQuery(self.users).select(Count(self.id_col))), [])
+        self.assertEqual(self.rules(SelectQuery(self.users).where(self.id_col.eq(1))), [])
+
+    def test_large_offset(self):
+        query = SelectQuery(self.users).limit(10).offset(50000)
+        self.assertEqual(self.rules(query), ["large_offset"])
+        self.assertEqual(self.rules(query, max_offset=100000), [])
+
+    def test_leading_wildcard(self):
+        query = SelectQuery(self.users).where(self.email_col.like("%@example.com"))
+        self.assertEqual(self.rules(query), ["leading_wildcard"])
+
+    def test_function_on_column(self):
+        query = SelectQuery(self.users).where(Function("LOWER", self.email_col).eq("a@example.com"))
+        self.assertEqual(self.rules(query), ["function_on_column"])
+        self.assertEqual(self.rules(query, indexed_columns=["users.id"]), [])
+        self.assertEqual(self.rules(query, indexed_columns=[self.email_col]), ["function_on_column"])
+
+    def test_large_in_list(self):
+        query = SelectQuery(self.users).where(self.id_col.in_(list(range(20))))
+        self.assertEqual(self.rules(query, max_in_list=10), ["large_in_list"])
+
+    def test_subquery_depth_and_nested_checks(self):
+        inner = SelectQuery(self.orders).select(self.user_id_col).where(self.user_id_col.in_(list(range(5))))
+        for _ in range(3):
+            inner = SelectQuery(self.orders).select(self.user_id_col).where(self.user_id_col.in_(inner))
+        query = SelectQuery(self.users).where(exists(inner))
+        self.assertEqual(self.rules(query, max_in_list=2), ["subquery_depth"])
+        self.assertEqual(self.rules(query, max_in_list=2, max_subquery_depth=4), ["large_in_list"])
+
+    def test_modes(self):
+        query = SelectQuery(self.users)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            QueryLinter().lint(query)
+        self.assertEqual([warning.category for warning in caught], [QueryGuardrailWarning])
+        with self.assertRaises(QueryGuardrailError) as context:
+            QueryLinter(mode="raise").lint(query)
+        self.assertIsInstance(context.exception, ValueError)
+        self.assertEqual(QueryLinter(mode="raise", disabled=["missing_limit"]).lint(query), [])
+        with self.assertRaises(ValueError):
+            QueryLinter(mode="ignore")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+import sqlite3
+import unittest
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.select import SelectQuery
+from src.sqlazybuilder.queries.optimizer import optimize, push_down_predicates, prune_columns, rewrite_subqueries
+from src.sqlazybuilder.expressions.conditions import Exists, exists, not_exists
+from src.sqlazybuilder.execution.executor import execute
+from src.sqlazybuilder.expressions.functions import Count, CountAll
+
+
+class TestOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.users = Table("users")
+        self.id_col = self.users.column("id")
+        self.username_col = self.users.column("username")
+        self.age_col = self.users.column("age")
+
+        self.orders = Table("orders")
+        self.user_id_col = self.orders.column("user_id")
+        self.total_col = self.orders.column("total")
+
+    def test_push_down_into_from_subquery(self):
+        subq = SelectQuery(self.users).select(self.username_col, self.age_col).as_alias("u")
+        query = SelectQuery(subq).select(subq.column("username")).where(subq.column("age").gt(25))
+        push_down_predicates(query)
+        self.assertEqual(
+            query.build(),
+            ("SELECT u.username FROM (SELECT users.username, users.age FROM users WHERE users.age > %s) AS u", [25]))
+
+    def test_push_down_resolves_inner_aliases(self):
+        subq = SelectQuery(self.users).select(self.age_col.as_alias("years")).as_alias("u")
+        query = SelectQuery(subq).where(subq.column("years").between(20, 30))
+        push_down_predicates(query)
+        self.assertEqual(
+            query.build(),
+            ("SELECT * FROM (SELECT users.age AS years FROM users WHERE users.age BETWEEN %s AND %s) AS u", [20, 30]))
+
+    def test_push_down_select_star_subquery(self):
+        subq = SelectQuery(self.users).as_alias("u")
+        query = SelectQuery(subq).where(subq.column("age").gt(25) & subq.column("username").ne("root"))
+        push_down_predicates(query)
+        self.assertEqual(
+            query.build(),
+            ("SELECT * FROM (SELECT * FROM users WHERE users.age > %s AND users.username != %s) AS u", [25, "root"]))
+
+    def test_split_conjunction_keeps_outer_parts(self):
+        subq = SelectQuery(self.users).select(self.id_col, self.age_col).as_alias("u")
+        query = (SelectQuery(subq)
+                 .select(subq.column("id"))
+                 .inner_join(self.orders, subq.column("id").eq(self.user_id_col))
+                 .where(subq.column("age").gt(25) & self.total_col.gt(100)))
+        push_down_predicates(query)
+        self.assertEqual(
+            query.build(),
+            ("SELECT u.id FROM (SELECT users.id, users.age FROM users WHERE users.age > %s) AS u "
+             "INNER JOIN orders ON u.id = orders.user_id WHERE orders.total > %s", [25, 100]))
+
+    def test_no_push_down_past_limit_or_group_by(self):
+        limited = SelectQuery(self.users).select(self.age_col).limit(10).as_alias("u")
+        query = SelectQuery(limited).where(limited.column("age").gt(25))
+        push_down_predicates(query)
+        self.assertEqual(len(query._conditions), 1)
+        self.assertEqual(limited._conditions, ())
+
+        grouped = (SelectQuery(self.orders)
+                   .select(self.user_id_col, Count(self.total_col).as_alias("n"))
+                   .group_by(self.user_id_col)
+                   .as_alias("g"))
+        query = SelectQuery(grouped).where(grouped.column("user_id").eq(1))
+        push_down_predicates(query)
+        self.assertEqual(len(query._conditions), 1)
+        self.assertEqual(grouped._conditions, ())
+
+    def test_no_push_down_into_null_extended_side(self):
+        subq = SelectQuery(self.orders).select(self.user_id_col, self.total_col).as_alias("o")
+        query = (SelectQuery(self.users)
+                 .left_join(subq, self.id_col.eq(subq.column("user_id")))
+                 .where(subq.column("total").gt(100)))
+        push_down_predicates(query)
+        self.assertEqual(subq._conditions, ())
+
+        subq = SelectQuery(self.users).select(self.id_col).as_alias("u")
+        query = (SelectQuery(subq)
+                 .right_join(self.orders, subq.column("id").eq(self.user_id_col))
+                 .where(subq.column("id").eq(1)))
+        push_down_predicates(query)
+        self.assertEqual(subq._conditions, ())
+
+    def test_push_down_into_inner_join_subquery(self):
+        subq = SelectQuery(self.orders).select(self.user_id_col, self.total_col).as_alias("o")
+        query = (SelectQuery(self.users)
+                 .select(self.username_col)
+                 .inner_join(subq, self.id_col.eq(subq.column("user_id")))
+                 .where(subq.column("total").gt(100), self.age_col.lt(30)))
+        optimize(query)
+        self.assertEqual(
+            query.build(),
+            ("SELECT users.username FROM users INNER JOIN "
+             "(SELECT orders.user_id FROM orders WHERE orders.total > %s) AS o "
+             "ON users.id = o.user_id WHERE users.age < %s", [100, 30]))
+
+    def test_prune_unreferenced_columns(self):
+        subq = SelectQuery(self.users).select(self.id_col, self.username_col, self.age_col).as_alias("u")
+        query = SelectQuery(subq).select(subq.column("username")).order_by(subq.column("id"))
+        prune_columns(query)
+        self.assertEqual(
+            query.build(),
+            ("SELECT u.username FROM (SELECT users.id, users.username FROM users) AS u ORDER BY u.id ASC", []))
+
+    def test_prune_keeps_all_columns_for_select_star(self):
+        subq = SelectQuery(self.users).select(self.id_col, self.username_col).as_alias("u")
+        query = SelectQuery(subq)
+        prune_columns(query)
+        self.assertEqual(len(subq._columns), 2)
+
+        query = SelectQuery(subq).select(subq.column("*"))
+        prune_columns(query)
+        self.assertEqual(query.build(),
+                         ("SELECT u.* FROM (SELECT users.id, users.username FROM users) AS u", []))
+
+    def test_prune_never_empties_subquery(self):
+        subq = SelectQuery(self.users).select(self.id_col, self.username_col).as_alias("u")
+        query = SelectQuery(subq).select(CountAll())
+        prune_columns(query)
+        self.assertEqual(query.build(), ("SELECT COUNT(*) FROM (SELECT users.id FROM users) AS u", []))
+
+    def test_optimize_leaves_shared_subqueries_alone(self):
+        subq = SelectQuery(self.users).select(self.id_col, self.username_col, self.age_col).as_alias("u")
+        subquery_sql = subq.build()
+        query = SelectQuery(subq).select(subq.column("username")).where(subq.column("id").gt(1))
+        other = SelectQuery(subq).select(subq.column("age"))
+        base = (SelectQuery(self.users).select(self.id_col).inner_join(subq, self.id_col.eq(subq.column("id"))))
+        base_sql = base.build()
+        optimize(query)
+        optimize(base.clone().where(subq.column("age").gt(18)))
+        self.assertEqual(
+            query.build(),
+            ("SELECT u.username FROM (SELECT users.username FROM users WHERE users.id > %s) AS u", [1]))
+        self.assertEqual(subq.build(), subquery_sql)
+        self.assertEqual(other.build()[0], f"SELECT u.age FROM ({subquery_sql[0]}) AS u")
+        self.assertEqual(base.build(), base_sql)
+
+    def test_optimize_nested_subqueries(self):
+        inner = SelectQuery(self.users).select(self.id_col, self.username_col, self.age_col).as_alias("a")
+        middle = SelectQuery(inner).select(inner.column("id"), inner.column("age")).as_alias("b")
+        query = SelectQuery(middle).select(middle.column("id")).where(middle.column("age").gt(18))
+        optimize(query)
+        self.assertEqual(
+            query.build(),
+            ("SELECT b.id FROM (SELECT a.id FROM (SELECT users.id FROM users "
+             "WHERE users.age > %s) AS a) AS b", [18]))
+
+
+class TestSubqueryRewrite(unittest.TestCase):
+    def setUp(self):
+        self.users = Table("users")
+        self.id_col = self.users.column("id")
+        self.orders = Table("orders")
+        self.user_id_col = self.orders.column("user_id")
+        self.total_col = self.orders.column("total")
+
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute("CREATE TABLE users (id INTEGER)")
+        self.connection.execute("CREATE TABLE orders (user_id INTEGER, total REAL)")
+        self.connection.executemany("INSERT INTO users VALUES (?)", [(1,), (2,), (3,), (None,)])
+        self.connection.executemany("INSERT INTO orders VALUES (?, ?)", [(1, 50), (2, 500), (None, 700)])
+
+    def tearDown(self):
+        self.connection.close()
+
+    def fetch(self, query):
+        return sorted(execute(self.connection.cursor(), query, "qmark").fetchall(), key=repr)
+
+    def orders_subquery(self, minimum):
+        return SelectQuery(self.orders).select(self.user_id_col).where(self.total_col.gt(minimum))
+
+    def test_in_to_exists(self):
+        query = SelectQuery(self.users).select(self.id_col).where(self.id_col.in_(self.orders_subquery(10)))
+        expected = self.fetch(query)
+        rewrite_subqueries(query, dialect="mysql")
+        self.assertEqual(
+            query.build(),
+            ("SELECT users.id FROM users WHERE EXISTS (SELECT orders.user_id FROM orders "
+             "WHERE orders.total > %s AND orders.user_id = users.id)", [10]))
+        self.assertEqual(self.fetch(query), expected)
+
+    def test_not_in_to_not_exists_keeps_null_semantics(self):
+        for minimum in (10, 600, 1000):
+            query = SelectQuery(self.users).select(self.id_col).where(
+                self.id_col.not_in(self.orders_subquery(minimum)))
+            expected = self.fetch(query)
+            rewrite_subqueries(query, dialect="postgresql")
+            self.assertIsInstance(query._conditions[0], Exists)
+            self.assertEqual(self.fetch(query), expected)
+
+    def test_not_in_to_not_exists_without_null_guards(self):
+        query = SelectQuery(self.users).select(self.id_col).where(
+            self.id_col.not_in(self.orders_subquery(10)))
+        rewrite_subqueries(query, prefer="exists", strict_nulls=False)
+        self.assertEqual(
+            query.build()[0],
+            "SELECT users.id FROM users WHERE NOT EXISTS (SELECT orders.user_id FROM orders "
+            "WHERE orders.total > %s AND orders.user_id = users.id)")
+        self.assertEqual(self.fetch(query), [(3,), (None,)])
+
+    def test_rewrite_nested_conditions_and_keeps_original_subquery(self):
+        subquery = self.orders_subquery(10)
+        subquery_sql = subquery.build()
+        queries = [
+            SelectQuery(self.users).select(self.id_col).where(self.id_col.in_(subquery) | self.id_col.eq(3)),
+            SelectQuery(self.users).select(self.id_col).where(~self.id_col.in_(subquery)),
+            SelectQuery(self.users).select(self.id_col).where(~self.id_col.not_in(subquery)),
+            SelectQuery(self.users).select(self.id_col).where(~(self.id_col.in_(subquery) | self.id_col.eq(3))),
+        ]
+        for query in queries:
+            with self.subTest(sql=query.build()[0]):
+                expected = self.fetch(query)
+                rewrite_subqueries(query, prefer="exists", strict_nulls=False)
+                self.assertEqual(self.fetch(query), expected)
+        self.assertIn("EXISTS", queries[0].build()[0])
+        self.assertNotIn("EXISTS", queries[3].build()[0])
+        self.assertEqual(subquery.build(), subquery_sql)
+
+    def test_exists_to_in(self):
+        subquery = SelectQuery(self.orders).where(self.user_id_col.eq(self.id_col), self.total_col.gt(100))
+        query = SelectQuery(self.users).select(self.id_col).where(exists(subquery))
+        expected = self.fetch(query)
+        rewrite_subqueries(query, dialect="sqlite")
+        self.assertEqual(
+            query.build(),
+            ("SELECT users.id FROM users WHERE users.id IN (SELECT orders.user_id FROM orders "
+             "WHERE orders.total > %s)", [100]))
+        self.assertEqual(self.fetch(query), expected)
+
+    def test_aggregate_exists_is_not_rewritten(self):
+        subquery = SelectQuery(self.orders).select(CountAll()).where(self.user_id_col.eq(self.id_col))
+        query = SelectQuery(self.users).select(self.id_col).where(exists(subquery))
+        expected = self.fetch(query)
+        rewrite_subqueries(query, prefer="in")
+        self.assertEqual(self.fetch(query), expected)
+        self.assertIsInstance(query._conditions[0], Exists)
+
+    def test_not_exists_to_not_in_needs_relaxed_nulls(self):
+        subquery = SelectQuery(self.orders).where(self.user_id_col.eq(self.id_col))
+        query = SelectQuery(self.users).where(not_exists(subquery))
+        rewrite_subqueries(query, prefer="in")
+        self.assertIsInstance(query._conditions[0], Exists)
+
+        rewrite_subqueries(query, prefer="in", strict_nulls=False)
+        self.assertEqual(query.build()[0],
+                         "SELECT * FROM users WHERE users.id NOT IN (SELECT orders.user_id FROM orders)")
+
+    def test_skips_unsafe_subqueries(self):
+        limited = self.orders_subquery(10).limit(1)
+        uncorrelated = SelectQuery(self.orders).where(self.total_col.gt(100))
+        self_reference = SelectQuery(self.users).select(self.id_col)
+        query = SelectQuery(self.users).where(
+            self.id_col.in_(limited), exists(uncorrelated), self.id_col.in_(self_reference))
+        before = query.build()
+        rewrite_subqueries(query, prefer="exists")
+        rewrite_subqueries(query, prefer="in")
+        self.assertEqual(query.build(), before)
+
+    def test_unknown_dialect(self):
+        with self.assertRaises(ValueError):
+            rewrite_subqueries(SelectQuery(self.users), dialect="oracle")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,19 @@
+import threading
+import tracemalloc
 import unittest
 from src.sqlazybuilder.core.table import Table
 from src.sqlazybuilder.queries.select import SelectQuery
-from src.sqlazybuilder.expressions.functions import CountAll, Avg
+from src.sqlazybuilder.expressions.conditions import Condition, exists
+from src.sqlazybuilder.expressions.functions import CountAll, Avg, Cast, CountDistinct, Function
+from src.sqlazybuilder.expressions.joins import InnerJoin
+
+
+class CountingCondition(Condition):
+    renders = 0
+
+    def _render(self, out, params):
+        CountingCondition.renders += 1
+        super()._render(out, params)
 
 
 class TestSelectQuery(unittest.TestCase):
@@ -199,5 +211,172 @@ class TestSelectQuery(unittest.TestCase):
         self.assertEqual(query, (expected_sql, expected_params))
 
 
+    def test_repeated_build_reuses_rendered_clauses(self):
+        CountingCondition.renders = 0
+        query = SelectQuery(self.users).where(
+            *[CountingCondition(self.age_col, ">", i) for i in range(10)])
+        first = query.build()
+        self.assertEqual(CountingCondition.renders, 10)
+        self.assertEqual(query.build(), first)
+        self.assertEqual(CountingCondition.renders, 10)
+
+        query.where(CountingCondition(self.username_col, "=", "John")).limit(5)
+        sql, params = query.build()
+        self.assertEqual(CountingCondition.renders, 11)
+        self.assertTrue(sql.endswith("AND users.username = %s LIMIT 5"))
+        self.assertEqual(params, list(range(10)) + ["John"])
+
+    def test_build_returns_independent_params(self):
+        query = SelectQuery(self.users).where(self.age_col.gt(20))
+        _, params = query.build()
+        params.append("mutated")
+        self.assertEqual(query.build(), ("SELECT * FROM users WHERE users.age > %s", [20]))
+
+    def test_rebuild_after_subquery_changes(self):
+        subq = SelectQuery(self.users).select(self.username_col).as_alias("filtered_users")
+        in_subq = SelectQuery(self.orders).select(self.user_id_col)
+        query = SelectQuery(subq).select(subq.column("username")).where(
+            subq.column("username").in_(in_subq))
+        query.build()
+
+        subq.where(self.age_col.gt(25))
+        in_subq.where(self.order_id_col.lt(500))
+        self.assertEqual(
+            query.build(),
+            ("SELECT filtered_users.username FROM (SELECT users.username FROM users WHERE users.age > %s) "
+             "AS filtered_users WHERE filtered_users.username IN "
+             "(SELECT orders.user_id FROM orders WHERE orders.order_id < %s)", [25, 500]))
+
+
+    def test_clone_shares_clauses_without_corrupting_base(self):
+        base = SelectQuery(self.users).select(self.username_col).where(self.age_col.gt(20))
+        base_query = base.build()
+
+        variant = base.clone().where(self.username_col.eq("John")).order_by(self.age_col).limit(5)
+        self.assertIs(variant._columns, base._columns)
+        self.assertEqual(
+            variant.build(),
+            ("SELECT users.username FROM users WHERE users.age > %s AND users.username = %s "
+             "ORDER BY users.age ASC LIMIT 5", [20, "John"]))
+        self.assertEqual(base.build(), base_query)
+
+    def test_clause_lists_grow_in_place(self):
+        query = SelectQuery(self.users).where(self.age_col.gt(0))
+        items = query._conditions._items
+        for i in range(1, 1000):
+            query.where(self.age_col.gt(i))
+        # Repeated builder calls extend one shared list instead of copying it.
+        self.assertIs(query._conditions._items, items)
+        self.assertEqual(len(query._conditions), 1000)
+
+        base = SelectQuery(self.users).where(self.age_col.gt(20))
+        first = base.clone().where(self.id_col.eq(1))
+        second = base.clone().where(self.id_col.eq(2))
+        self.assertIs(first._conditions._items, base._conditions._items)
+        self.assertEqual([str(condition) for condition in base._conditions], ["users.age > %s"])
+        self.assertEqual(first.build()[1], [20, 1])
+        self.assertEqual(second.build()[1], [20, 2])
+        self.assertEqual(second._conditions[-1].value, 2)
+        self.assertEqual(second._conditions[:1], base._conditions)
+
+    def test_realiased_subquery_invalidates_cache(self):
+        sub = SelectQuery(self.orders).select(self.user_id_col).as_alias("s1")
+        query = SelectQuery(sub).inner_join(sub, self.id_col.eq(1)).where(self.id_col.in_(sub))
+        self.assertIn("AS s1", query.build()[0])
+        sub.as_alias("s2")
+        sql = query.build()[0]
+        self.assertNotIn("AS s1", sql)
+        self.assertEqual(sql.count("AS s2"), 2)
+
+    def test_clone_reuses_rendered_fragments(self):
+        CountingCondition.renders = 0
+        base = SelectQuery(self.users).where(*[CountingCondition(self.age_col, ">", i) for i in range(5)])
+        base.build()
+        variant = base.clone().where(CountingCondition(self.id_col, "=", 1))
+        variant.build()
+        self.assertEqual(CountingCondition.renders, 6)
+
+    def test_concurrent_fan_out(self):
+        base = SelectQuery(self.users).select(self.username_col).where(self.age_col.gt(20))
+        expected_base = base.build()
+        results = {}
+
+        def derive(worker):
+            for i in range(50):
+                variant = base.clone().where(self.id_col.eq(worker * 100 + i))
+                results[(worker, i)] = variant.build()
+
+        threads = [threading.Thread(target=derive, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(base.build(), expected_base)
+        self.assertEqual(results[(3, 7)][1], [20, 307])
+        self.assertTrue(all(sql.endswith("AND users.id = %s") for sql, _ in results.values()))
+
+    def test_alias_copies_shared_objects(self):
+        aliased_table = self.users.as_alias("u")
+        self.assertEqual(str(self.users), "users")
+        self.assertEqual(str(aliased_table), "users AS u")
+
+        average = Avg(self.age_col)
+        aliased_average = average.as_alias("average_age")
+        self.assertEqual(str(average), "AVG(users.age)")
+        self.assertEqual(str(aliased_average), "AVG(users.age) AS average_age")
+
+    def test_str_and_params_come_from_render(self):
+        subquery = SelectQuery(self.orders).select(self.user_id_col).where(self.order_id_col.gt(10))
+        subquery_sql = "SELECT orders.user_id FROM orders WHERE orders.order_id > %s"
+        expressions = [
+            (self.age_col.between(18, 30), "users.age BETWEEN %s AND %s", [18, 30]),
+            (self.age_col.is_null(), "users.age IS NULL", []),
+            (self.id_col.in_([1, 2, 3]) | ~self.username_col.like("a%"),
+             "(users.id IN (%s, %s, %s) OR NOT (users.username LIKE %s))", [1, 2, 3, "a%"]),
+            (self.id_col.in_(subquery) & exists(subquery),
+             f"(users.id IN ({subquery_sql}) AND EXISTS ({subquery_sql}))", [10, 10]),
+            (Function("COALESCE", self.age_col, 0).as_alias("age"), "COALESCE(users.age, %s) AS age", [0]),
+            (Cast(5, "TEXT"), "CAST(%s AS TEXT)", [5]),
+            (CountDistinct(self.id_col), "COUNT(DISTINCT users.id)", []),
+            (CountAll(), "COUNT(*)", []),
+            (InnerJoin(subquery.as_alias("o"), self.id_col.eq(Table("o").column("user_id")) & self.age_col.gt(18)),
+             f"INNER JOIN ({subquery_sql}) AS o ON (users.id = o.user_id AND users.age > %s)", [10, 18]),
+        ]
+        for expression, sql, params in expressions:
+            with self.subTest(sql=sql):
+                self.assertEqual((str(expression), expression.params), (sql, params))
+
+    def test_frozen_build_returns_cached_tuple(self):
+        query = SelectQuery(self.users).where(self.id_col.in_([1, 2]))
+        sql, params = query.build(frozen=True)
+        self.assertEqual((sql, params), ("SELECT * FROM users WHERE users.id IN (%s, %s)", (1, 2)))
+        self.assertIs(query.build(frozen=True)[1], params)
+        self.assertEqual(query.build(), (sql, [1, 2]))
+
+    def test_build_allocation_budget(self):
+        # Each condition below is eight nodes: AND, OR, three comparisons and
+        # their three columns.
+        nodes_per_condition = 8
+        count = 500
+        query = SelectQuery(self.users).where(*[
+            self.age_col.gt(i) & (self.username_col.like("a%") | self.id_col.in_([i, i + 1]))
+            for i in range(count)])
+
+        tracemalloc.start()
+        try:
+            query.build(frozen=True)
+            _, cold_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            retained, _ = tracemalloc.get_traced_memory()
+            query.build(frozen=True)
+            _, warm_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(cold_peak / (count * nodes_per_condition), 256)
+        self.assertLess(warm_peak - retained, 2048)
+
+
 if __name__ == '__main__':
     unittest.main()
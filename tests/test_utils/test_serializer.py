@@ -0,0 +1,117 @@
+import datetime
+import pickle
+import unittest
+from decimal import Decimal
+from src.sqlazybuilder.core.table import Table
+from src.sqlazybuilder.queries.select import SelectQuery
+from src.sqlazybuilder.expressions.functions import Avg, Cast, Coalesce, CountAll, CountDistinct, Substring
+from src.sqlazybuilder.expressions.conditions import not_exists
+from src.sqlazybuilder.utils.serializer import (dumps, loads, MAGIC, FORMAT_VERSION, MARSHAL_VERSION, _pack_ints,
+                                                _unpack_ints)
+
+
+class TestSerializer(unittest.TestCase):
+
+    def setUp(self):
+        self.users = Table("users", columns={"id": "INTEGER", "username": "TEXT", "age": "INTEGER"})
+        self.orders = Table("orders")
+        self.user_id_col = self.orders.column("user_id")
+        self.order_id_col = self.orders.column("order_id")
+
+    def assertRoundTrip(self, query):
+        restored = loads(dumps(query))
+        self.assertEqual(restored.build(), query.build())
+        return restored
+
+    def test_full_query_round_trip(self):
+        subq = (SelectQuery(self.orders)
+                .select(self.user_id_col)
+                .where(self.order_id_col.gt(1000))
+                .as_alias("big_orders"))
+        in_subq = SelectQuery(self.orders).select(self.user_id_col).where(self.order_id_col.lt(500))
+        query = (SelectQuery(self.users)
+                 .select(self.users.c.username, Avg(self.users.c.age).as_alias("average_age"),
+                         Coalesce(self.users.c.username, "n/a"), Substring(self.users.c.username, 1, 3),
+                         Cast(self.users.c.age, "TEXT"), CountDistinct(self.users.c.id), CountAll())
+                 .inner_join(subq, self.users.c.id.eq(subq.column("user_id")))
+                 .left_join(self.orders, self.users.c.id.eq(self.user_id_col))
+                 .where((self.users.c.username.eq("Alice") | ~self.users.c.age.between(1, 2)) &
+                        self.users.c.id.in_(in_subq),
+                        self.users.c.age.not_in((3, 4)),
+                        self.users.c.username.is_not_null(),
+                        not_exists(in_subq))
+                 .group_by(self.users.c.username)
+                 .having(Avg(self.users.c.age).gt(25))
+                 .order_by(self.users.c.username, "DESC")
+                 .limit(10)
+                 .offset(5))
+        self.assertRoundTrip(query)
+
+    def test_shared_nodes_stay_shared(self):
+        query = SelectQuery(self.users).select(self.users.c.id).where(self.users.c.id.gt(1))
+        restored = loads(dumps(query))
+        self.assertIs(restored._columns[0], restored._conditions[0].column)
+        self.assertIs(restored._columns[0].table, restored._table)
+        self.assertIs(restored._table.c.id.table, restored._table)
+        self.assertEqual(restored._table.c.age.eq("7").params, [7])
+
+    def test_rich_scalar_values(self):
+        values = [datetime.datetime(2024, 1, 2, 3, 4, 5), datetime.date(2024, 1, 2),
+                  datetime.time(12, 30), Decimal("1.50"), b"\x00\x01", None, True, 2.5]
+        query = SelectQuery(self.orders).where(self.order_id_col.in_(values))
+        restored = self.assertRoundTrip(query)
+        self.assertEqual(restored._conditions[0].value, values)
+
+    def test_signed_zero_and_equal_values_stay_distinct(self):
+        values = [0.0, -0.0, 1, 1.0, True]
+        restored = self.assertRoundTrip(SelectQuery(self.orders).where(self.order_id_col.in_(values)))
+        self.assertEqual([(type(value), str(value)) for value in restored._conditions[0].value],
+                         [(float, "0.0"), (float, "-0.0"), (int, "1"), (float, "1.0"), (bool, "True")])
+
+    def test_unsupported_values(self):
+        with self.assertRaises(TypeError):
+            dumps(SelectQuery(self.orders).where(self.order_id_col.eq(object())))
+
+    def test_deep_condition_tree(self):
+        condition = self.order_id_col.eq(0)
+        for i in range(1, 20000):
+            condition = condition | self.order_id_col.eq(i)
+        query = SelectQuery(self.orders).where(condition)
+        restored = loads(dumps(query))
+        depth = 0
+        node = restored._conditions[0]
+        while hasattr(node, "conditions"):
+            node = node.conditions[0]
+            depth += 1
+        self.assertEqual(depth, 19999)
+        self.assertEqual(node.value, 0)
+
+    def test_compact_compared_to_pickle(self):
+        query = (SelectQuery(self.users)
+                 .select(self.users.c.username)
+                 .where(*[self.users.c.age.gt(i) for i in range(100)]))
+        self.assertLess(len(dumps(query)), len(pickle.dumps(query)))
+
+    def test_packed_ints_record_a_fixed_width(self):
+        for values, width in (([0, 255], 1), ([256], 2), ([1 << 16, (1 << 32) - 1], 4), ([1 << 32], 8)):
+            with self.subTest(width=width):
+                packed = _pack_ints(values)
+                self.assertEqual(packed[0], width)
+                self.assertEqual(len(packed[1]), width * len(values))
+                self.assertEqual(list(_unpack_ints(packed)), values)
+        with self.assertRaises(ValueError):
+            _unpack_ints(("L", b""))
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            loads(b"nope")
+        data = dumps(SelectQuery(self.orders))
+        for invalid in (MAGIC, MAGIC + bytes([FORMAT_VERSION]), data[:-3],
+                        MAGIC + bytes([99]) + data[len(MAGIC) + 1:],
+                        MAGIC + bytes([FORMAT_VERSION, MARSHAL_VERSION + 1]) + data[len(MAGIC) + 2:]):
+            with self.assertRaises(ValueError):
+                loads(invalid)
+
+
+if __name__ == '__main__':
+    unittest.main()